@@ -0,0 +1,104 @@
+"""
+Prediksi batch tanpa antarmuka Streamlit, misalnya untuk dijalankan lewat cron.
+
+Contoh:
+    python streamlit_app/batch_predict.py ekspor_bulanan.xlsx -o hasil_prediksi.xlsx --workers 4 --benchmark
+"""
+import argparse
+import os
+import sys
+import time
+
+from scoring import (MODEL_FILENAME, SCALER_FILENAME, MODEL_RF_FILENAME, REQUIRED_COLUMNS, DEFAULT_CHUNKSIZE,
+                     DEFAULT_N_WORKERS, load_model_and_scaler, iter_chunks, predict_batch, score_stream)
+
+# Path artefak model relatif terhadap root repositori, bukan direktori kerja cron
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prediksi jumlah dan kategori investasi dari file Excel/CSV.")
+    parser.add_argument('input', help="File .xlsx atau .csv yang berisi kolom komponen investasi")
+    parser.add_argument('-o', '--output', help="File hasil (.xlsx atau .csv). Default: <input>_prediksi.xlsx")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"Jumlah baris per potongan (default: {DEFAULT_CHUNKSIZE})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_N_WORKERS,
+                        help=f"Jumlah worker inferensi random forest (default: {DEFAULT_N_WORKERS})")
+    parser.add_argument('--benchmark', action='store_true', help="Tampilkan waktu proses dan baris per detik")
+    return parser.parse_args(argv)
+
+
+def score_to_csv(input_path, output_path, chunksize, n_workers, model_filename, modelRF_filename, scaler_filename):
+    processed = 0
+    with open(input_path, 'rb') as source:
+        chunks = iter_chunks(source, chunksize)
+        try:
+            for _, chunk in chunks:
+                missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+                if missing:
+                    raise ValueError(f"File harus mengandung kolom berikut: {', '.join(REQUIRED_COLUMNS)}")
+
+                predictions, categories = predict_batch(chunk, model_filename, modelRF_filename, scaler_filename,
+                                                        n_workers)
+                chunk = chunk.assign(**{'Prediksi Investasi': predictions, 'Kategori Investasi': categories})
+                chunk.to_csv(output_path, mode='w' if processed == 0 else 'a', header=processed == 0, index=False)
+                processed += len(chunk)
+        finally:
+            chunks.close()
+    return processed
+
+
+def remove_partial_output(output_path):
+    # File hasil yang baru ditulis sebagian tidak boleh tertinggal dan terbaca sebagai hasil lengkap
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    model_filename = os.path.join(REPO_ROOT, MODEL_FILENAME)
+    modelRF_filename = os.path.join(REPO_ROOT, MODEL_RF_FILENAME)
+    scaler_filename = os.path.join(REPO_ROOT, SCALER_FILENAME)
+
+    if not args.input.lower().endswith(('.xlsx', '.csv')):
+        print("Format file tidak sesuai. Gunakan file .xlsx atau .csv.", file=sys.stderr)
+        return 2
+    if not os.path.isfile(args.input):
+        print(f"File input tidak ditemukan: {args.input}", file=sys.stderr)
+        return 2
+    output_path = args.output or os.path.splitext(args.input)[0] + '_prediksi.xlsx'
+
+    start = time.perf_counter()
+    load_model_and_scaler(model_filename, scaler_filename)
+    load_model_and_scaler(modelRF_filename, scaler_filename)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        if output_path.lower().endswith('.csv'):
+            n_rows = score_to_csv(args.input, output_path, args.chunksize, args.workers,
+                                  model_filename, modelRF_filename, scaler_filename)
+        else:
+            with open(args.input, 'rb') as source:
+                n_rows, _ = score_stream(source, output_path, args.chunksize, None,
+                                         model_filename, modelRF_filename, scaler_filename, args.workers)
+    except ValueError as e:
+        remove_partial_output(output_path)
+        print(e, file=sys.stderr)
+        return 2
+    except BaseException:
+        remove_partial_output(output_path)
+        raise
+    elapsed = time.perf_counter() - start
+
+    print(f"{n_rows:,} baris diprediksi, hasil disimpan ke {output_path}")
+    if args.benchmark:
+        rows_per_second = n_rows / elapsed if elapsed > 0 else float('inf')
+        print(f"Waktu muat model : {load_time:.3f} detik")
+        print(f"Waktu prediksi   : {elapsed:.3f} detik ({args.workers} worker, potongan {args.chunksize:,} baris)")
+        print(f"Throughput       : {rows_per_second:,.0f} baris/detik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Membandingkan kecepatan engine pembaca xlsx untuk data OSS.
+
+Setiap workbook dibaca dengan pd.read_excel (openpyxl mode penuh, cara lama) dan
+dengan setiap engine di ingest.READERS (openpyxl read_only, calamine bila terpasang),
+lalu hasil antar-engine dicek sama setelah konversi tipe.
+
+Contoh:
+    python streamlit_app/bench_ingest.py
+    python streamlit_app/bench_ingest.py Predict/dataset_CLEAN.xlsx --repeat 3
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from ingest import READERS, apply_dtypes, read_workbook
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_time(load, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = load()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark engine pembaca xlsx.")
+    parser.add_argument('files', nargs='*', help="File .xlsx (default: semua workbook di folder TEST SISTEM)")
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah pengulangan; waktu tercepat yang dilaporkan")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(os.path.join(REPO_ROOT, 'TEST SISTEM', '*.xlsx')))
+    status = 0
+    for path in files:
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        # Cara lama: pd.read_excel lalu inferensi tanggal per nilai
+        def load_pandas():
+            data = pd.read_excel(BytesIO(content))
+            if 'Tanggal Terbit Oss' in data.columns:
+                data['Tanggal Terbit Oss'] = pd.to_datetime(data['Tanggal Terbit Oss'], errors='coerce')
+            return data
+
+        _, pandas_time = best_time(load_pandas, args.repeat)
+        print(f"{os.path.relpath(path)}")
+        print(f"  {'pandas read_excel':<20}: {pandas_time * 1000:9.1f} ms")
+
+        results = {}
+        for engine in READERS:
+            results[engine], elapsed = best_time(lambda: apply_dtypes(read_workbook(BytesIO(content), engine)),
+                                                 args.repeat)
+            rows, cols = results[engine].shape
+            print(f"  {engine:<20}: {elapsed * 1000:9.1f} ms ({pandas_time / elapsed:4.1f}x), "
+                  f"{rows:,} baris x {cols} kolom")
+
+        reference_engine, reference = next(iter(results.items()))
+        for engine, result in results.items():
+            if not result.equals(reference):
+                print(f"  PERINGATAN: hasil {engine} berbeda dengan {reference_engine}", file=sys.stderr)
+                status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+import numpy as np
+import pandas as pd
+
+# Kolom yang paling sering dipakai sebagai filter di halaman Analisa
+INDEX_COLUMNS = ['kecamatan_usaha', 'Tahun Terbit', 'KL/Sektor Pembina', 'Uraian Jenis Perusahaan']
+
+# Dimensi tiap cube agregat, satu cube per kelompok grafik Analisa. Satu cube dengan semua
+# dimensi hampir sebesar data mentah (kelurahan x bulan x KBLI x ...), sehingga rollup-nya
+# tidak lebih cepat dari groupby biasa; cube kecil per kelompok tetap jauh lebih sedikit selnya
+CUBE_GROUPS = [
+    # Sektor, bulan, dan kecamatan per tahun
+    ['kecamatan_usaha', 'Tahun Terbit', 'Tanggal Bulan Terbit', 'KL/Sektor Pembina'],
+    # KBLI per kecamatan/tahun dan per sektor pembina
+    ['Judul Kbli', 'KL/Sektor Pembina', 'kecamatan_usaha', 'Tahun Terbit'],
+    # Jenis perusahaan per kecamatan/kelurahan
+    ['Uraian Jenis Perusahaan', 'kecamatan_usaha', 'kelurahan_usaha', 'Tahun Terbit'],
+    # Risiko, skala usaha, jenis proyek, dan status penanaman modal
+    ['Uraian Risiko Proyek', 'Uraian_Jenis_Proyek', 'Uraian Skala Usaha', 'Uraian Status Penanaman Modal'],
+]
+# Measure per sel: jumlah baris, total kolom nilai, dan posisi baris pertama (untuk urutan kemunculan)
+CUBE_SUMS = ['Jumlah Investasi', 'Modal Kerja']
+
+# Kunci proyek untuk deduplikasi saat data baru ditambahkan ke data tersimpan
+KEY_COLUMNS = ['Id Proyek', 'Nib']
+
+
+def group_positions(values):
+    """
+    Mapping nilai -> array posisi baris (terurut naik) untuk satu kolom. Nilai kosong tidak diindeks.
+    """
+    grouped = values.groupby(values, sort=False, observed=True)
+    return {key: positions.astype(np.int64) for key, positions in grouped.indices.items()}
+
+
+def row_keys(data, columns=KEY_COLUMNS):
+    """
+    Hash uint64 per baris dari kolom kunci. Kolom angka disamakan ke float64 agar
+    'Nib' yang terbaca int di satu file dan float di file lain menghasilkan hash yang sama.
+    """
+    keys = pd.DataFrame({col: data[col].astype('float64') if pd.api.types.is_numeric_dtype(data[col])
+                         else data[col].astype(object) for col in columns if col in data.columns})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def unique_rows(data, known_keys=None):
+    """
+    Baris `data` yang kuncinya tidak ada di `known_keys` (hasil row_keys), masing-masing kunci
+    sekali (kemunculan pertama). Baris tanpa Id Proyek maupun Nib selalu dianggap baru.
+    """
+    keys = pd.Index(row_keys(data))
+    present = [col for col in KEY_COLUMNS if col in data.columns]
+    keyless = data[present].isna().all(axis=1).to_numpy() if present else np.ones(len(data), dtype=bool)
+    fresh = ~keys.duplicated()
+    if known_keys is not None:
+        fresh &= ~keys.isin(known_keys)
+    return data[keyless | fresh]
+
+
+def concat_frames(base, rows):
+    """
+    Menyambung `rows` di bawah `base` (index 0..n-1) dengan tetap mempertahankan kolom
+    categorical: kategori kedua bagian digabung lalu diurutkan seperti compact_dtypes.
+    """
+    base = base.copy(deep=False)
+    rows = rows.copy(deep=False)
+    for col in base.columns:
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and col in rows.columns:
+            new_values = pd.Index(pd.unique(rows[col].dropna().to_numpy()))
+            categories = base[col].cat.categories.union(new_values)
+            if not categories.equals(base[col].cat.categories):
+                base[col] = base[col].cat.set_categories(categories)
+            rows[col] = rows[col].astype(object).astype(pd.CategoricalDtype(categories))
+    return pd.concat([base, rows], ignore_index=True)
+
+
+class AggregateCube:
+    """
+    Jumlah baris serta total 'Jumlah Investasi' dan 'Modal Kerja' pada grain terhalus
+    `dimensions` (nilai kosong ikut menjadi sel). Grafik Analisa dijawab dengan rollup
+    dari sel-sel ini, bukan dengan memindai baris data mentah.
+    """
+
+    def __init__(self, data, dimensions, _labels=None, _codes=None, _offset=0):
+        self.dimensions = [dim for dim in dimensions if dim in data.columns]
+        self.sums = [col for col in CUBE_SUMS if col in data.columns]
+        self.labels = {}
+        self._codes = {}
+
+        columns = {}
+        for dim in self.dimensions:
+            if _labels is None:
+                # Kode mengikuti urutan nilai yang sudah diurutkan, sehingga grouping kode = grouping nilai
+                codes, uniques = pd.factorize(data[dim], sort=True)
+                if isinstance(data[dim].dtype, pd.CategoricalDtype):
+                    uniques = pd.Index(np.asarray(uniques), dtype=object)
+                self.labels[dim] = pd.Index(uniques)
+                self._codes[dim] = {label: code for code, label in enumerate(self.labels[dim])}
+            else:
+                codes = self._encode(dim, data[dim], _labels, _codes)
+            columns[dim] = codes
+        for col in self.sums:
+            columns[col] = data[col].to_numpy()
+        columns['Baris Pertama'] = _offset + np.arange(len(data))
+
+        frame = pd.DataFrame(columns)
+        aggregations = {col: 'sum' for col in self.sums}
+        aggregations['Baris Pertama'] = 'min'
+        grouped = frame.groupby(self.dimensions, sort=False)
+        self.cells = grouped.agg(aggregations)
+        self.cells.insert(0, 'Jumlah', grouped.size())
+        self.cells = self.cells.reset_index()
+        self._cell_keys = None
+        self._cell_arrays = None
+
+    def _encode(self, dim, values, labels, codes_lookup):
+        """
+        Kode `values` terhadap label cube lain; nilai yang belum dikenal mendapat kode baru
+        di akhir sehingga kode lama tetap berlaku. Nilai kosong mendapat kode -1.
+        """
+        known = labels[dim]
+        values = np.asarray(values, dtype=object) if known.dtype == object else np.asarray(values)
+        codes = known.get_indexer(values)
+        missing = pd.isna(values)
+        unknown = (codes < 0) & ~missing
+        lookup = codes_lookup[dim]
+        if unknown.any():
+            new_labels = pd.Index(pd.unique(values[unknown])).sort_values()
+            lookup = {**lookup, **{label: len(known) + i for i, label in enumerate(new_labels)}}
+            known = known.append(new_labels)
+            codes = known.get_indexer(values)
+        self.labels[dim] = known
+        self._codes[dim] = lookup
+        return np.where(missing, -1, codes)
+
+    def _keys(self):
+        # Hash kode dimensi per sel, dibangun sekali lalu diperpanjang oleh append
+        if self._cell_keys is None:
+            self._cell_keys = pd.Index(pd.util.hash_pandas_object(self.cells[self.dimensions], index=False).to_numpy())
+        return self._cell_keys
+
+    def append(self, data, offset):
+        """
+        Cube baru untuk data lama ditambah baris `data` yang menempati posisi `offset`, `offset + 1`, ...
+        Hanya sel yang terkena baris baru yang diperbarui; sel lain disalin apa adanya.
+        """
+        delta = AggregateCube(data, self.dimensions, _labels=self.labels, _codes=self._codes, _offset=offset)
+        delta_keys = pd.util.hash_pandas_object(delta.cells[self.dimensions], index=False).to_numpy()
+        positions = self._keys().get_indexer(delta_keys)
+        matched = positions >= 0
+
+        cells = self.cells.copy()
+        for col in ['Jumlah'] + self.sums:
+            values = cells[col].to_numpy()
+            added = delta.cells[col].to_numpy()[matched]
+            if np.issubdtype(values.dtype, np.integer) and np.issubdtype(added.dtype, np.floating):
+                values = values.astype('float64')
+            # Sel lama: tambahkan measure baris baru; 'Baris Pertama' tidak berubah karena baris baru di akhir
+            np.add.at(values, positions[matched], added)
+            cells[col] = values
+
+        merged = AggregateCube.__new__(AggregateCube)
+        merged.dimensions, merged.sums = self.dimensions, self.sums
+        merged.labels, merged._codes = delta.labels, delta._codes
+        merged.cells = pd.concat([cells, delta.cells[~matched]], ignore_index=True)
+        merged._cell_keys = self._keys().append(pd.Index(delta_keys[~matched]))
+        merged._cell_arrays = None
+        return merged
+
+    def _arrays(self):
+        # Kolom sel sebagai array NumPy, dibuat sekali per cube
+        if self._cell_arrays is None:
+            self._cell_arrays = {col: self.cells[col].to_numpy() for col in self.cells.columns}
+        return self._cell_arrays
+
+    def _mask(self, filters):
+        # Boolean per sel yang memenuhi filters, atau None bila tanpa filter
+        arrays = self._arrays()
+        mask = None
+        for dim, value in (filters or {}).items():
+            code = self._codes[dim].get(value)
+            matched = arrays[dim] == code if code is not None else np.zeros(len(self.cells), dtype=bool)
+            mask = matched if mask is None else mask & matched
+        return mask
+
+    def _rollup(self, by, filters, measures):
+        # {kolom: array} berisi label `by` dan measure yang diminta per grup, urut naik berdasarkan `by`
+        arrays = self._arrays()
+        mask = self._mask(filters)
+        for dim in by:
+            valid = arrays[dim] >= 0
+            mask = valid if mask is None else mask & valid
+        positions = np.flatnonzero(mask)
+
+        # Kode beberapa kolom digabung menjadi satu kode datar; mengurutkannya sama dengan
+        # mengurutkan per kolom, lalu setiap grup dijumlahkan dengan reduceat tanpa groupby
+        sizes = [len(self.labels[dim]) for dim in by]
+        flat = np.ravel_multi_index([arrays[dim][positions] for dim in by], sizes)
+        order = np.argsort(flat, kind='stable')
+        flat = flat[order]
+        positions = positions[order]
+        starts = np.flatnonzero(np.r_[True, flat[1:] != flat[:-1]]) if len(flat) else np.empty(0, dtype=np.int64)
+
+        result = {}
+        for dim, codes in zip(by, np.unravel_index(flat[starts], sizes)):
+            result[dim] = self.labels[dim].take(codes)
+        for col in measures:
+            values = arrays[col][positions]
+            reduce = np.minimum if col == 'Baris Pertama' else np.add
+            result[col] = reduce.reduceat(values, starts) if len(starts) else values[:0]
+        if any(not self.labels[dim].is_monotonic_increasing for dim in by):
+            # Label baru dari append berada di akhir, jadi urutan kode tidak lagi sama dengan urutan nilai
+            order = pd.DataFrame({dim: result[dim] for dim in by}).sort_values(by, kind='stable').index.to_numpy()
+            result = {col: values.take(order) for col, values in result.items()}
+        return result
+
+    def rollup(self, by, filters=None):
+        """
+        Jumlah baris, total measure, dan posisi baris pertama per nilai `by` (satu kolom atau list)
+        untuk sel yang memenuhi `filters` {kolom: nilai}. Seperti groupby biasa, grup dengan
+        nilai kosong dilewati dan hasil diurutkan naik berdasarkan `by`.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        return pd.DataFrame(self._rollup(by, filters, ['Jumlah'] + self.sums + ['Baris Pertama']))
+
+    def count(self, by, filters=None, name='Jumlah'):
+        """
+        Setara `groupby(by).size().reset_index(name=name)` pada baris yang memenuhi filter.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        result = self._rollup(by, filters, ['Jumlah'])
+        result[name] = result.pop('Jumlah')
+        return pd.DataFrame(result)
+
+    def sum(self, by, column, filters=None):
+        """
+        Setara `groupby(by)[column].sum().reset_index()` pada baris yang memenuhi filter.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        return pd.DataFrame(self._rollup(by, filters, [column]))
+
+    def value_counts(self, column, filters=None):
+        """
+        Setara `data[column].value_counts()`: urut menurun, nilai yang sama banyak tetap
+        berurutan sesuai kemunculan pertamanya di data.
+        """
+        result = self._rollup([column], filters, ['Jumlah', 'Baris Pertama'])
+        order = np.argsort(result['Baris Pertama'], kind='stable')
+        counts = pd.Series(result['Jumlah'][order], index=pd.Index(np.asarray(result[column])[order]), name=column)
+        return counts.sort_values(ascending=False)
+
+    def total(self, filters=None):
+        """
+        Jumlah baris dan total measure (dict, tipe tiap kolom dipertahankan) untuk baris yang memenuhi filter.
+        """
+        arrays = self._arrays()
+        mask = self._mask(filters)
+        return {col: (arrays[col] if mask is None else arrays[col][mask]).sum() for col in ['Jumlah'] + self.sums}
+
+
+class AggregateCubes:
+    """
+    Sekumpulan AggregateCube, satu per kelompok dimensi CUBE_GROUPS, dengan API yang sama
+    seperti AggregateCube. Setiap query dijawab oleh cube terkecil yang memuat semua kolom
+    `by` dan kolom filternya.
+    """
+
+    def __init__(self, data, groups=CUBE_GROUPS, _cubes=None):
+        self.cubes = [AggregateCube(data, dims) for dims in groups] if _cubes is None else _cubes
+
+    def _cube(self, by, filters):
+        columns = set([by] if isinstance(by, str) else by) | set(filters or {})
+        candidates = [cube for cube in self.cubes if columns <= set(cube.dimensions)]
+        if not candidates:
+            raise KeyError(f"Tidak ada cube agregat dengan dimensi {sorted(columns)}")
+        return min(candidates, key=lambda cube: len(cube.cells))
+
+    def append(self, data, offset):
+        """
+        Kumpulan cube baru untuk data lama ditambah baris `data` (lihat AggregateCube.append).
+        """
+        return AggregateCubes(None, _cubes=[cube.append(data, offset) for cube in self.cubes])
+
+    def rollup(self, by, filters=None):
+        return self._cube(by, filters).rollup(by, filters)
+
+    def count(self, by, filters=None, name='Jumlah'):
+        return self._cube(by, filters).count(by, filters, name)
+
+    def sum(self, by, column, filters=None):
+        return self._cube(by, filters).sum(by, column, filters)
+
+    def value_counts(self, column, filters=None):
+        return self._cube(column, filters).value_counts(column, filters)
+
+    def total(self, filters=None):
+        return self._cube([], filters).total(filters)
+
+
+class IndexedDataset:
+    """
+    Data hasil ingest beserta indeks posisi baris untuk INDEX_COLUMNS. Filter seperti
+    "kecamatan X pada tahun Y" dijawab dengan irisan indeks, bukan pemindaian boolean
+    seluruh baris. Daftar pilihan selectbox juga dihitung sekali per kolom, dan agregat
+    grafik tersedia lewat `cube` (AggregateCubes). `digest` mengidentifikasi isi data
+    (misalnya untuk cache file unduhan), None bila tidak diketahui.
+    """
+
+    def __init__(self, data, index_columns=INDEX_COLUMNS, _indices=None, _options=None, _cube=None, digest=None,
+                 _keys=None):
+        self.data = data
+        self.digest = digest
+        if _indices is None:
+            _indices = {col: group_positions(data[col]) for col in index_columns if col in data.columns}
+        self._indices = _indices
+        self._options = {} if _options is None else _options
+        self.cube = AggregateCubes(data) if _cube is None else _cube
+        self._keys = _keys
+
+    def copy(self):
+        """
+        Salinan dangkal DataFrame dengan indeks, daftar pilihan, dan cube yang dipakai bersama.
+        """
+        return IndexedDataset(self.data.copy(deep=False), _indices=self._indices, _options=self._options,
+                              _cube=self.cube, digest=self.digest, _keys=self._keys)
+
+    def keys(self):
+        """
+        Indeks hash KEY_COLUMNS (Id Proyek/Nib) seluruh baris, dibangun sekali saat pertama dipakai.
+        """
+        if self._keys is None:
+            self._keys = pd.Index(row_keys(self.data))
+        return self._keys
+
+    def new_rows(self, data):
+        """
+        Baris `data` yang kuncinya belum ada di dataset ini (lihat unique_rows).
+        """
+        return unique_rows(data, self.keys())
+
+    def append(self, rows, digest=None):
+        """
+        Dataset baru berisi data ini ditambah `rows` di bagian akhir. Indeks grup, indeks kunci,
+        dan cube diperbarui hanya untuk nilai yang muncul di `rows`; daftar pilihan selectbox
+        dihitung ulang saat dibutuhkan.
+        """
+        offset = len(self.data)
+        data = concat_frames(self.data, rows)
+        indices = dict(self._indices)
+        for col, positions in self._indices.items():
+            indices[col] = dict(positions)
+            for key, added in group_positions(rows[col]).items():
+                added = added + offset
+                indices[col][key] = np.concatenate([positions[key], added]) if key in positions else added
+        keys = self._keys.append(pd.Index(row_keys(rows))) if self._keys is not None else None
+        return IndexedDataset(data, _indices=indices, _cube=self.cube.append(rows, offset), digest=digest, _keys=keys)
+
+    def options(self, column):
+        """
+        Nilai unik kolom sesuai urutan kemunculan, sama seperti `data[column].unique()`.
+        """
+        if column not in self._options:
+            self._options[column] = self.data[column].unique()
+        return self._options[column]
+
+    def positions(self, filters):
+        """
+        Posisi baris yang memenuhi semua filter {kolom: nilai} (kolom harus terindeks).
+        """
+        result = None
+        # Irisan dimulai dari grup terkecil agar array sementara tetap kecil
+        groups = sorted((self._indices[col].get(value, np.empty(0, dtype=np.int64)) for col, value in filters.items()),
+                        key=len)
+        for positions in groups:
+            result = positions if result is None else np.intersect1d(result, positions, assume_unique=True)
+        return np.arange(len(self.data)) if result is None else result
+
+    def select(self, filters):
+        """
+        Baris yang memenuhi semua filter {kolom: nilai}, urutan dan index sama seperti filter boolean.
+        """
+        return self.data.iloc[self.positions(filters)]
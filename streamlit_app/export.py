@@ -0,0 +1,169 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import xlsxwriter
+
+try:
+    import pyarrow  # noqa: F401  (dibutuhkan pandas untuk menulis Parquet)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Cache bytes file unduhan, dikunci dengan digest data + format. File yang sama tidak
+# dibuat ulang untuk pengguna atau rerun berikutnya; entri terlama dibuang lebih dulu.
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get('PRIDE_EXPORT_CACHE_MB', '256')) * 1024 * 1024
+
+_export_cache = OrderedDict()
+_export_cache_lock = threading.Lock()
+
+
+def open_excel_writer(output_path, sheet_name='Sheet1'):
+    """
+    Membuka workbook xlsxwriter dalam mode constant memory: setiap baris langsung
+    ditulis ke file sehingga memori tidak bertambah sesuai jumlah sel.
+    Mengembalikan (workbook, worksheet, format tanggal).
+    """
+    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet(sheet_name)
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+    return workbook, worksheet, date_format
+
+
+def cell_value(value):
+    # xlsxwriter tidak dapat menulis NaN/NaT, tulis sebagai sel kosong
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    if not isinstance(value, (str, bool, int, float, datetime, date)):
+        # Misalnya pd.Period pada kolom 'Bulan Terbit'
+        return str(value)
+    return value
+
+
+def write_rows(worksheet, first_row, rows, date_format):
+    """
+    Menulis baris (iterable tuple) mulai dari baris `first_row`; mengembalikan jumlah baris.
+    """
+    count = 0
+    for offset, row in enumerate(rows):
+        for col, value in enumerate(row):
+            value = cell_value(value)
+            if isinstance(value, datetime):
+                worksheet.write_datetime(first_row + offset, col, value, date_format)
+            else:
+                worksheet.write(first_row + offset, col, value)
+        count += 1
+    return count
+
+
+def to_excel_bytes(df, sheet_name='Sheet1'):
+    # Mode constant memory xlsxwriter hanya berlaku untuk file di disk, bukan BytesIO
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        output_path = tmp.name
+    try:
+        workbook, worksheet, date_format = open_excel_writer(output_path, sheet_name)
+        try:
+            worksheet.write_row(0, 0, [str(col) for col in df.columns])
+            write_rows(worksheet, 1, df.itertuples(index=False, name=None), date_format)
+        finally:
+            workbook.close()
+        with open(output_path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(output_path)
+
+
+def to_csv_bytes(df, sheet_name=None):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def to_parquet_bytes(df, sheet_name=None):
+    output = BytesIO()
+    # Kolom period (misalnya 'Bulan Terbit') disimpan sebagai teks agar mudah dibaca aplikasi lain
+    period_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.PeriodDtype)]
+    df = df.astype({col: str for col in period_columns})
+    # Kolom object bercampur tipe (misalnya angka dan teks) tidak dapat ditulis Arrow; nilainya
+    # ditulis sebagai teks, sel kosong tetap kosong
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) in ('mixed', 'mixed-integer'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    df.to_parquet(output, index=False)
+    return output.getvalue()
+
+
+def export_formats():
+    """
+    Format unduhan yang tersedia: label -> (ekstensi, MIME type, fungsi pembuat bytes).
+    """
+    formats = {
+        'Excel (.xlsx)': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', to_excel_bytes),
+        'CSV (.csv)': ('.csv', 'text/csv', to_csv_bytes),
+    }
+    if PARQUET_AVAILABLE:
+        formats['Parquet (.parquet)'] = ('.parquet', 'application/octet-stream', to_parquet_bytes)
+    return formats
+
+
+def cached_export(cache_key, format_label, sheet_name):
+    """
+    Bytes file unduhan dari cache, atau None bila belum pernah dibuat.
+    """
+    key = (cache_key, format_label, sheet_name)
+    with _export_cache_lock:
+        data = _export_cache.get(key)
+        if data is not None:
+            _export_cache.move_to_end(key)
+    return data
+
+
+def build_export(df, format_label, sheet_name='Sheet1', cache_key=None):
+    """
+    Membuat bytes file unduhan dalam format `format_label` (lihat export_formats).
+    Bila `cache_key` diberikan, hasilnya disimpan di cache agar tidak dibuat ulang.
+    """
+    if cache_key is not None:
+        data = cached_export(cache_key, format_label, sheet_name)
+        if data is not None:
+            return data
+
+    _, _, build = export_formats()[format_label]
+    data = build(df, sheet_name)
+
+    if cache_key is not None:
+        with _export_cache_lock:
+            _export_cache[(cache_key, format_label, sheet_name)] = data
+            while len(_export_cache) > 1 and sum(len(v) for v in _export_cache.values()) > EXPORT_CACHE_MAX_BYTES:
+                _export_cache.popitem(last=False)
+    return data
+
+
+def download_section(df, file_stem, key, label="Download", sheet_name='Sheet1', cache_key=None):
+    """
+    Menampilkan pilihan format dan tombol unduh. File baru dibuat ketika pengguna
+    menekan tombol "Siapkan File", bukan pada setiap rerun. Bila `cache_key` (digest
+    data) diberikan, file yang sudah pernah dibuat langsung tersedia untuk diunduh.
+    """
+    formats = export_formats()
+    selected_format = st.selectbox("Format file:", list(formats), key=f'{key}_format')
+    extension, mime, _ = formats[selected_format]
+
+    data = cached_export(cache_key, selected_format, sheet_name) if cache_key is not None else None
+    if data is None and st.button("Siapkan File", key=f'{key}_prepare'):
+        try:
+            with st.spinner("Menyiapkan file unduhan..."):
+                data = build_export(df, selected_format, sheet_name, cache_key)
+        except Exception as e:
+            st.error(f"Terjadi kesalahan saat menyiapkan file {selected_format}: {e}")
+    if data is not None:
+        st.download_button(label=label, data=data, file_name=f'{file_stem}{extension}', mime=mime,
+                           key=f'{key}_download')
@@ -0,0 +1,199 @@
+"""
+Evaluator random forest berbasis array NumPy datar.
+
+Pohon-pohon RandomForestClassifier diekspor ke array kontigu (fitur, threshold,
+anak kiri/kanan, dan probabilitas daun) yang disimpan sebagai file .joblib
+sehingga dapat di-memory-map oleh registry model. Evaluasi dilakukan untuk
+seluruh pohon dan seluruh baris sekaligus per level kedalaman.
+
+Contoh:
+    python streamlit_app/flat_forest.py export
+    python streamlit_app/flat_forest.py verify
+"""
+import argparse
+import functools
+import hashlib
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from model_registry import load_artifact
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Jumlah baris yang dievaluasi per blok agar array (pohon x baris) tetap kecil
+BLOCK_ROWS = 20000
+
+
+def export_forest(model, source_hash=None):
+    """
+    Mengubah RandomForestClassifier scikit-learn menjadi dict berisi array datar.
+    """
+    n_classes = len(model.classes_)
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        node_ids = np.arange(offset, offset + n_nodes)
+        is_leaf = tree.children_left == -1
+
+        # Daun menunjuk ke dirinya sendiri sehingga traversal berhenti di daun
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+        rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+
+        # Probabilitas daun dinormalisasi persis seperti DecisionTreeClassifier.predict_proba
+        proba = tree.value[:, 0, :n_classes].astype(np.float64)
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        values.append(proba / normalizer)
+
+        roots.append(offset)
+        offset += n_nodes
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        'feature': np.concatenate(features).astype(np.int16),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'value': np.concatenate(values),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'classes': np.asarray(model.classes_),
+        'max_depth': int(max_depth),
+        'n_features': int(model.n_features_in_),
+        'source_hash': source_hash,
+    }
+
+
+def predict_proba_flat(forest, X):
+    """
+    Rata-rata probabilitas kelas dari seluruh pohon, setara RandomForestClassifier.predict_proba.
+    """
+    # Seperti scikit-learn, fitur dibandingkan dalam float32 terhadap threshold float64
+    X = np.asarray(X, dtype=np.float32)
+    feature, threshold = forest['feature'], forest['threshold']
+    left, right, value = forest['left'], forest['right'], forest['value']
+    roots = forest['roots']
+
+    proba = np.zeros((len(X), value.shape[1]), dtype=np.float64)
+    for start in range(0, len(X), BLOCK_ROWS):
+        block = X[start:start + BLOCK_ROWS]
+        rows = np.arange(len(block))
+        node = np.repeat(roots[:, np.newaxis], len(block), axis=1)
+        for _ in range(forest['max_depth']):
+            go_left = block[rows, feature[node]] <= threshold[node]
+            node = np.where(go_left, left[node], right[node])
+
+        # Akumulasi berurutan per pohon agar hasil penjumlahan identik dengan scikit-learn
+        leaf_values = value[node]
+        block_proba = proba[start:start + BLOCK_ROWS]
+        for tree_values in leaf_values:
+            block_proba += tree_values
+
+    proba /= len(roots)
+    return proba
+
+
+def predict_flat(forest, X):
+    return forest['classes'].take(np.argmax(predict_proba_flat(forest, X), axis=1), axis=0)
+
+
+@functools.lru_cache(maxsize=8)
+def _source_hash(path, mtime, size):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def source_hash(path):
+    stat = os.stat(path)
+    return _source_hash(os.path.abspath(path), stat.st_mtime, stat.st_size)
+
+
+def flat_forest_path(source_filename):
+    # Forest datar disimpan di samping file model aslinya: <nama>_flat.joblib
+    return os.path.splitext(source_filename)[0] + '_flat.joblib'
+
+
+def load_flat_forest(source_filename):
+    """
+    Memuat forest datar dari registry bila ada dan berasal dari file model
+    `source_filename` yang sama; selain itu mengembalikan None.
+    """
+    flat_filename = flat_forest_path(source_filename)
+    if not os.path.exists(flat_filename):
+        return None
+    forest = load_artifact(flat_filename)
+    if forest.get('source_hash') != source_hash(source_filename):
+        return None
+    return forest
+
+
+def main(argv=None):
+    import pandas as pd
+    from scoring import MODEL_RF_FILENAME, SCALER_FILENAME, REQUIRED_COLUMNS
+
+    parser = argparse.ArgumentParser(description="Ekspor dan verifikasi random forest berbasis array datar.")
+    parser.add_argument('command', choices=['export', 'verify'])
+    parser.add_argument('--dataset', default=os.path.join(REPO_ROOT, 'Predict/dataset_CLEAN.xlsx'),
+                        help="Dataset untuk verifikasi kesamaan prediksi")
+    args = parser.parse_args(argv)
+
+    model_path = os.path.join(REPO_ROOT, MODEL_RF_FILENAME)
+    flat_path = flat_forest_path(model_path)
+    model = load_artifact(model_path)
+
+    if args.command == 'export':
+        forest = export_forest(model, source_hash(model_path))
+        joblib.dump(forest, flat_path)
+        print(f"{os.path.relpath(flat_path)}: {os.path.getsize(flat_path) / 1024:,.1f} KiB "
+              f"(pickle asli {os.path.getsize(model_path) / 1024:,.1f} KiB), "
+              f"{len(forest['feature']):,} node, kedalaman maksimum {forest['max_depth']}")
+        return 0
+
+    forest = load_flat_forest(model_path)
+    if forest is None:
+        print("File forest datar tidak ada atau tidak sesuai dengan model. Jalankan perintah 'export' dahulu.",
+              file=sys.stderr)
+        return 1
+
+    scaler = load_artifact(os.path.join(REPO_ROOT, SCALER_FILENAME))
+    data = pd.read_excel(args.dataset)
+    features = scaler.transform(data[REQUIRED_COLUMNS].astype(float))
+
+    start = time.perf_counter()
+    expected = model.predict(features)
+    sklearn_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = predict_flat(forest, features)
+    flat_time = time.perf_counter() - start
+
+    proba_equal = np.array_equal(model.predict_proba(features), predict_proba_flat(forest, features))
+    mismatches = int((expected != actual).sum())
+    print(f"{len(features):,} baris: {mismatches} prediksi berbeda, probabilitas identik: {proba_equal}")
+    print(f"Batch penuh : scikit-learn {sklearn_time * 1000:.1f} ms, forest datar {flat_time * 1000:.1f} ms")
+
+    # Latensi satu baris, seperti pada jalur input manual
+    single = features[:1]
+    repeats = 200
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(single)
+    sklearn_single = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict_flat(forest, single)
+    flat_single = (time.perf_counter() - start) / repeats
+    print(f"Satu baris  : scikit-learn {sklearn_single * 1000:.2f} ms, forest datar {flat_single * 1000:.2f} ms")
+    return 0 if mismatches == 0 and proba_equal else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,495 @@
+import difflib
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from dataset import IndexedDataset
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    SIDECAR_AVAILABLE = True
+except ImportError:
+    SIDECAR_AVAILABLE = False
+
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Cache hasil parsing file unggahan, dikunci dengan hash isi file. Dibatasi
+# jumlah entri dan total memori DataFrame; entri terlama dibuang lebih dulu.
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get('PRIDE_PARSE_CACHE_ENTRIES', '8'))
+PARSE_CACHE_MAX_BYTES = int(os.environ.get('PRIDE_PARSE_CACHE_MB', '512')) * 1024 * 1024
+
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+_parse_cache_stats = {'hits': 0, 'misses': 0, 'sidecar_hits': 0}
+
+# Salinan Parquet dari data yang sudah dinormalisasi, disimpan di disk agar sesi baru atau
+# unggahan ulang file yang sama tidak perlu mem-parsing xlsx lagi. Dibatasi total ukuran;
+# file yang paling lama tidak dipakai dihapus lebih dulu.
+SIDECAR_DIR = os.environ.get('PRIDE_SIDECAR_DIR',
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'uploads'))
+SIDECAR_MAX_BYTES = int(os.environ.get('PRIDE_SIDECAR_MB', '1024')) * 1024 * 1024
+# Dinaikkan setiap kali hasil normalize_upload berubah agar sidecar lama tidak dipakai
+SIDECAR_VERSION = 3
+
+# Tipe eksplisit per kolom data OSS, sehingga hasilnya tidak bergantung pada isi file
+# (misalnya NIK atau nomor telepon yang kebetulan semuanya berupa angka)
+INT_COLUMNS = ['No.', 'Nib', 'Kbli', 'Jumlah Investasi', 'TKI']
+FLOAT_COLUMNS = [
+    'longitude', 'latitude', 'Mesin Peralatan', 'Mesin Peralatan Impor', 'Pembelian Pematangan Tanah',
+    'Bangunan Gedung', 'Modal Kerja', 'Lain Lain',
+]
+TEXT_COLUMNS = [
+    'Id Proyek', 'Uraian_Jenis_Proyek', 'Nama Perusahaan', 'Uraian Status Penanaman Modal', 'Uraian Jenis Perusahaan',
+    'Uraian Risiko Proyek', 'nama_proyek', 'Uraian Skala Usaha', 'Alamat Usaha', 'Kab Kota Usaha', 'kecamatan_usaha',
+    'kelurahan_usaha', 'Judul Kbli', 'KL/Sektor Pembina', 'Nama User', 'Nomor Identitas User', 'Email', 'Nomor Telp',
+    'luas_tanah', 'satuan_tanah',
+]
+DATE_COLUMN = 'Tanggal Terbit Oss'
+
+# Batas kemiripan difflib untuk menerima header yang ejaannya sedikit berbeda
+HEADER_MATCH_CUTOFF = 0.8
+
+# Format tanggal teks pada ekspor OSS (hari lebih dulu), dicoba berurutan tanpa inferensi per nilai
+DATE_FORMATS = ['%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d/%m/%Y %H:%M:%S', '%d-%m-%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S']
+# Tanggal serial Excel dihitung dari 30-12-1899 (sudah memperhitungkan bug tahun kabisat 1900)
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+EXCEL_MAX_SERIAL = 2958465  # 31-12-9999
+
+# Engine pembaca xlsx: calamine (Rust) bila terpasang, selain itu openpyxl mode read_only
+DEFAULT_ENGINE = os.environ.get('PRIDE_XLSX_ENGINE', 'calamine' if CALAMINE_AVAILABLE else 'openpyxl')
+
+# Kolom teks yang nilainya berulang; disimpan sebagai categorical (kode integer + daftar kategori)
+CATEGORY_COLUMNS = [
+    'Uraian_Jenis_Proyek', 'Uraian Status Penanaman Modal', 'Uraian Jenis Perusahaan', 'Uraian Risiko Proyek',
+    'Uraian Skala Usaha', 'Kab Kota Usaha', 'kecamatan_usaha', 'kelurahan_usaha', 'Judul Kbli',
+    'KL/Sektor Pembina', 'satuan_tanah',
+]
+
+
+def _header_key(name):
+    # 'Uraian_Jenis_Proyek', 'uraian jenis proyek' dan 'Uraian Jenis  Proyek' dianggap sama
+    return ' '.join(str(name).replace('_', ' ').replace('.', ' ').lower().split())
+
+
+def match_columns(columns, correct_columns):
+    """
+    Mencocokkan header file dengan `correct_columns` berdasarkan nama, bukan posisi: sama persis,
+    sama setelah normalisasi (huruf besar/kecil, spasi, '_' dan '.'), lalu kemiripan difflib.
+    Mengembalikan (mapping nama di file -> nama benar, daftar kolom benar yang tidak ditemukan).
+    """
+    mapping = {}
+    remaining = [col for col in correct_columns if col not in columns]
+    unmatched = [col for col in columns if col not in correct_columns]
+    for col in columns:
+        if col in correct_columns:
+            mapping[col] = col
+
+    keys = {_header_key(col): col for col in remaining}
+    for col in list(unmatched):
+        target = keys.get(_header_key(col))
+        if target is not None and target in remaining:
+            mapping[col] = target
+            remaining.remove(target)
+            unmatched.remove(col)
+
+    # Pasangan paling mirip dipasangkan lebih dulu agar satu header tidak "mencuri" kolom lain
+    candidates = sorted(
+        ((difflib.SequenceMatcher(None, _header_key(col), _header_key(target)).ratio(), col, target)
+         for col in unmatched for target in remaining),
+        key=lambda candidate: candidate[0], reverse=True)
+    for ratio, col, target in candidates:
+        if ratio < HEADER_MATCH_CUTOFF:
+            break
+        if col in unmatched and target in remaining:
+            mapping[col] = target
+            unmatched.remove(col)
+            remaining.remove(target)
+
+    return mapping, remaining
+
+
+def _read_rows_openpyxl(source):
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        return [list(row) for row in workbook.worksheets[0].iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+
+def _read_rows_calamine(source):
+    rows = CalamineWorkbook.from_filelike(source).get_sheet_by_index(0).to_python()
+    # calamine membaca semua angka sebagai float; bilangan bulat dikembalikan ke int seperti openpyxl
+    return [[int(v) if isinstance(v, float) and v.is_integer() else v for v in row] for row in rows]
+
+
+READERS = {'openpyxl': _read_rows_openpyxl}
+if CALAMINE_AVAILABLE:
+    READERS['calamine'] = _read_rows_calamine
+
+
+def read_workbook(source, engine=None):
+    """
+    Membaca sheet pertama file xlsx menjadi DataFrame bertipe object (belum dikonversi).
+    `engine` adalah salah satu kunci READERS; default DEFAULT_ENGINE.
+    """
+    rows = READERS[engine or DEFAULT_ENGINE](source)
+    # Baris yang seluruh selnya kosong dilewati, seperti pd.read_excel
+    rows = [row for row in rows if any(v is not None and v != '' for v in row)]
+    if not rows:
+        return pd.DataFrame()
+
+    width = max(len(row) for row in rows)
+    header = [name if name not in (None, '') else f'Unnamed: {i}'
+              for i, name in enumerate(list(rows[0]) + [None] * (width - len(rows[0])))]
+    body = [row + [None] * (width - len(row)) for row in rows[1:]]
+    return pd.DataFrame(body, columns=header, dtype=object)
+
+
+def _blank_to_nan(values):
+    """
+    Array object dari `values` dengan sel kosong ('' atau None) diganti NaN.
+    """
+    array = values.to_numpy(dtype=object, copy=True)
+    array[(array == '') | pd.isna(array)] = np.nan
+    return array
+
+
+def parse_dates(values):
+    """
+    Mengubah kolom tanggal menjadi datetime64. Angka dan teks angka dibaca sebagai tanggal
+    serial Excel, teks dicocokkan dengan DATE_FORMATS secara berurutan.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return _from_excel_serial(values.astype(float))
+
+    values = pd.Series(_blank_to_nan(values), index=values.index)
+    result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+    is_text = values.map(lambda v: isinstance(v, str))
+    is_number = values.map(lambda v: isinstance(v, (int, float, np.number)) and not isinstance(v, bool))
+    is_datetime = values.notna() & ~is_text & ~is_number
+
+    if is_datetime.any():
+        result[is_datetime] = pd.to_datetime(values[is_datetime], errors='coerce')
+    if is_number.any():
+        result[is_number] = _from_excel_serial(values[is_number].astype(float))
+
+    text = values[is_text].astype(str).str.strip()
+    serial = pd.to_numeric(text, errors='coerce')
+    if serial.notna().any():
+        result[serial.index[serial.notna()]] = _from_excel_serial(serial[serial.notna()])
+    remaining = text[serial.isna()]
+    for date_format in DATE_FORMATS:
+        if remaining.empty:
+            break
+        parsed = pd.to_datetime(remaining, format=date_format, errors='coerce')
+        result[parsed.index[parsed.notna()]] = parsed[parsed.notna()]
+        remaining = remaining[parsed.isna()]
+    return result
+
+
+def _from_excel_serial(serial):
+    serial = serial.where((serial >= 1) & (serial <= EXCEL_MAX_SERIAL))
+    return EXCEL_EPOCH + pd.to_timedelta(serial, unit='D')
+
+
+def apply_dtypes(df):
+    """
+    Mengonversi kolom OSS ke tipe eksplisitnya (INT_COLUMNS, FLOAT_COLUMNS, TEXT_COLUMNS dan
+    DATE_COLUMN). Kolom lain dikonversi ke angka bila seluruh nilainya angka.
+    """
+    for col in df.columns:
+        if col == DATE_COLUMN:
+            df[col] = parse_dates(df[col])
+        elif col in TEXT_COLUMNS:
+            values = _blank_to_nan(df[col])
+            df[col] = [v if isinstance(v, str) or v is np.nan else str(v) for v in values]
+        elif col in INT_COLUMNS or col in FLOAT_COLUMNS:
+            values = pd.to_numeric(_blank_to_nan(df[col]), errors='coerce').astype('float64')
+            # Kolom integer yang memiliki nilai kosong tetap float64, seperti pd.read_excel
+            if col in INT_COLUMNS and not np.isnan(values).any() and (values % 1 == 0).all():
+                values = values.astype('int64')
+            df[col] = values
+        elif df[col].dtype == object:
+            values = _blank_to_nan(df[col])
+            try:
+                df[col] = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                df[col] = pd.Series(values, index=df.index).infer_objects()
+    return df
+
+
+def content_hash(uploaded_file):
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+def compact_dtypes(df):
+    """
+    Mengubah kolom teks berulang menjadi categorical dan memperkecil kolom integer
+    (int64 -> int32/int16/int8) selama semua nilainya tetap sama persis.
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+
+    # Kolom float tetap float64: penjumlahan float32 pada groupby tidak lagi presisi
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def _used_categories(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.remove_unused_categories()
+    return series
+
+
+def group_by(df, column):
+    """
+    groupby untuk kolom categorical: hanya kategori yang muncul pada `df` yang menjadi grup,
+    terurut seperti groupby kolom teks biasa.
+    """
+    # observed=True pada pandas 1.5 tidak mengurutkan grup, jadi kategori kosong dibuang lebih dulu
+    return df.groupby(_used_categories(df[column]))
+
+
+def central_tendency(df, by, column):
+    """
+    Rata-rata, median, dan modus `column` per nilai `by` (kolom 'mean', 'median', 'mode'),
+    terurut seperti group_by. Modus dihitung sekaligus untuk semua grup dari frekuensi
+    pasangan (grup, nilai); bila beberapa nilai sama seringnya, dipilih nilai terkecil.
+    Nilai kosong dilewati, sama seperti mean dan median.
+    """
+    result = group_by(df, by)[column].agg(['mean', 'median'])
+
+    # Kode terurut: pasangan (grup, nilai) menjadi satu bilangan sehingga np.unique
+    # menghasilkan frekuensi per grup dengan nilai terurut naik di dalam tiap grup
+    key_codes, key_labels = pd.factorize(df[by], sort=True)
+    value_codes, value_labels = pd.factorize(df[column], sort=True)
+    valid = (key_codes >= 0) & (value_codes >= 0)
+    pairs, counts = np.unique(key_codes[valid].astype(np.int64) * len(value_labels) + value_codes[valid],
+                              return_counts=True)
+    groups, values = np.divmod(pairs, len(value_labels))
+
+    # lexsort stabil: per grup frekuensi terbesar di depan, seri tetap berurutan nilai terkecil
+    order = np.lexsort((-counts, groups))
+    _, first = np.unique(groups[order], return_index=True)
+    winners = order[first]
+    modes = pd.Series(np.asarray(value_labels)[values[winners]],
+                      index=np.asarray(key_labels, dtype=object)[groups[winners]])
+    result['mode'] = modes.reindex(np.asarray(result.index, dtype=object)).to_numpy()
+    return result
+
+
+def memory_report(before, after):
+    """
+    Membandingkan memori per kolom (hasil `memory_usage(deep=True)`) sebelum dan sesudah compact_dtypes.
+    """
+    report = pd.DataFrame({
+        'Tipe Awal': before['dtypes'],
+        'Tipe Baru': after['dtypes'],
+        'Memori Awal (KB)': before['memory'] / 1024,
+        'Memori Baru (KB)': after['memory'] / 1024,
+    })
+    report.loc['Total'] = ['', '', report['Memori Awal (KB)'].sum(), report['Memori Baru (KB)'].sum()]
+    report['Penghematan (%)'] = (1 - report['Memori Baru (KB)'] / report['Memori Awal (KB)']) * 100
+    return report.rename_axis('Kolom').reset_index()
+
+
+def _memory_snapshot(df):
+    return {'dtypes': df.dtypes.astype(str), 'memory': df.memory_usage(deep=True, index=False)}
+
+
+def add_derived_columns(df):
+    """
+    Menambahkan kolom turunan 'Tanggal Terbit Oss' yang dipakai bersama oleh semua bagian analisis:
+    'Tahun Terbit', 'Bulan Terbit' (period bulanan) dan 'Tanggal Bulan Terbit' (awal bulan).
+    """
+    df['Tahun Terbit'] = df[DATE_COLUMN].dt.year
+    df['Bulan Terbit'] = df[DATE_COLUMN].dt.to_period('M')
+    df['Tanggal Bulan Terbit'] = df['Bulan Terbit'].dt.to_timestamp()
+    return df
+
+
+def normalize_upload(data, correct_columns):
+    """
+    Validasi header terhadap `correct_columns`, konversi tipe, dan kolom turunan tanggal
+    dalam satu kali proses. Header yang tidak dapat dicocokkan menimbulkan ValueError.
+    Mengembalikan (DataFrame, daftar peringatan untuk ditampilkan, laporan memori).
+    """
+    warnings = []
+    mapping, missing = match_columns(list(data.columns), correct_columns)
+    if missing:
+        raise ValueError(f"Kolom berikut tidak ditemukan dalam file: {', '.join(missing)}")
+
+    renamed = [f"'{old}' → '{new}'" for old, new in mapping.items() if old != new]
+    if renamed:
+        warnings.append(f"Nama kolom disesuaikan: {', '.join(renamed)}.")
+    extra_columns = [col for col in data.columns if col not in mapping]
+    if extra_columns:
+        warnings.append(f"Kolom tambahan tidak dikenal tetap disertakan: {', '.join(map(str, extra_columns))}.")
+
+    # Kolom diurutkan sesuai correct_columns, kolom tambahan di bagian akhir
+    adjusted_data = data.rename(columns=mapping)[list(correct_columns) + extra_columns]
+
+    filled_dates = pd.notna(_blank_to_nan(adjusted_data[DATE_COLUMN])) if DATE_COLUMN in adjusted_data else None
+    adjusted_data = apply_dtypes(adjusted_data)
+
+    if DATE_COLUMN in adjusted_data.columns:
+        invalid_dates = int((filled_dates & adjusted_data[DATE_COLUMN].isna()).sum())
+        if invalid_dates:
+            warnings.append(f"{invalid_dates} nilai 'Tanggal Terbit Oss' tidak dapat dibaca sebagai tanggal.")
+        adjusted_data = add_derived_columns(adjusted_data)
+    else:
+        warnings.append("Kolom 'Tanggal Terbit Oss' tidak ditemukan dalam data.")
+
+    before = _memory_snapshot(adjusted_data)
+    adjusted_data = compact_dtypes(adjusted_data)
+    report = memory_report(before, _memory_snapshot(adjusted_data))
+
+    return adjusted_data, warnings, report
+
+
+def sidecar_path(digest, correct_columns):
+    columns_digest = hashlib.sha256('\x1f'.join(correct_columns).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(SIDECAR_DIR, f'{digest}_{columns_digest}_v{SIDECAR_VERSION}.parquet')
+
+
+def read_sidecar(path):
+    """
+    Membaca sidecar Parquet; mengembalikan (DataFrame, peringatan, laporan memori) atau None.
+    """
+    if not SIDECAR_AVAILABLE or not os.path.exists(path):
+        return None
+    try:
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[b'pride'])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        # File rusak atau ditulis versi lain: abaikan dan parsing ulang dari xlsx
+        return None
+    os.utime(path)  # Menandai sidecar sebagai baru dipakai untuk eviction
+    return table.to_pandas(), meta['warnings'], pd.DataFrame(meta['report'])
+
+
+def write_sidecar(path, data, warnings, report):
+    if not SIDECAR_AVAILABLE:
+        return
+    # Ditulis ke file sementara lalu di-rename agar sesi lain tidak membaca file setengah jadi
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        # Kolom tambahan berisi campuran tipe (misalnya angka dan teks) tidak dapat dikonversi
+        # ke Arrow; sidecar dilewati saja karena hanya cache, unggahan tetap diproses
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        meta = json.dumps({'warnings': warnings, 'report': report.to_dict(orient='list')})
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'pride': meta.encode('utf-8')})
+        os.makedirs(SIDECAR_DIR, exist_ok=True)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    evict_sidecars()
+
+
+def _sidecar_files():
+    if not os.path.isdir(SIDECAR_DIR):
+        return []
+    files = []
+    for entry in os.scandir(SIDECAR_DIR):
+        if entry.name.endswith('.parquet'):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    return files
+
+
+def evict_sidecars(max_bytes=None):
+    """
+    Menghapus sidecar yang paling lama tidak dipakai sampai total ukurannya di bawah batas.
+    """
+    max_bytes = SIDECAR_MAX_BYTES if max_bytes is None else max_bytes
+    files = sorted(_sidecar_files())
+    total = sum(size for _, size, _ in files)
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def parse_upload(uploaded_file, correct_columns):
+    """
+    Membaca dan menormalisasi file unggahan. Hasil untuk isi file yang sama diambil
+    dari cache LRU sehingga rerun karena perubahan widget tidak mem-parsing ulang file,
+    lalu dari sidecar Parquet di disk, baru terakhir dari file xlsx.
+    Mengembalikan (IndexedDataset, daftar peringatan, laporan memori).
+    """
+    digest = content_hash(uploaded_file)
+    key = (digest, tuple(correct_columns))
+
+    with _parse_cache_lock:
+        entry = _parse_cache.get(key)
+        if entry is not None:
+            _parse_cache.move_to_end(key)
+            _parse_cache_stats['hits'] += 1
+    if entry is not None:
+        dataset, warnings, report, _ = entry
+        # Salinan dangkal: kolom baru yang ditambahkan pemanggil tidak mengubah isi cache
+        return dataset.copy(), list(warnings), report
+
+    path = sidecar_path(digest, correct_columns)
+    sidecar = read_sidecar(path)
+    if sidecar is not None:
+        data, warnings, report = sidecar
+    else:
+        data = read_workbook(BytesIO(uploaded_file.getvalue()))
+        data, warnings, report = normalize_upload(data, correct_columns)
+        write_sidecar(path, data, warnings, report)
+    # Indeks grup dibangun sekali per file lalu dipakai bersama oleh semua rerun. Digest mengikuti
+    # nama sidecar: isi file, daftar kolom, dan versi normalisasi
+    dataset = IndexedDataset(data, digest=os.path.splitext(os.path.basename(path))[0])
+    size = int(data.memory_usage(deep=True).sum())
+
+    with _parse_cache_lock:
+        _parse_cache_stats['sidecar_hits' if sidecar is not None else 'misses'] += 1
+        _parse_cache[key] = (dataset, warnings, report, size)
+        while len(_parse_cache) > 1 and (len(_parse_cache) > PARSE_CACHE_MAX_ENTRIES
+                                         or sum(e[-1] for e in _parse_cache.values()) > PARSE_CACHE_MAX_BYTES):
+            _parse_cache.popitem(last=False)
+
+    return dataset.copy(), list(warnings), report
+
+
+def parse_cache_info():
+    """
+    Statistik cache parsing: jumlah hit, hit sidecar, miss, entri, total memori (byte),
+    serta jumlah dan ukuran file sidecar di disk.
+    """
+    sidecars = _sidecar_files()
+    with _parse_cache_lock:
+        return {
+            'hits': _parse_cache_stats['hits'],
+            'sidecar_hits': _parse_cache_stats['sidecar_hits'],
+            'misses': _parse_cache_stats['misses'],
+            'entries': len(_parse_cache),
+            'bytes': sum(entry[-1] for entry in _parse_cache.values()),
+            'sidecar_files': len(sidecars),
+            'sidecar_bytes': sum(size for _, size, _ in sidecars),
+        }
@@ -0,0 +1,173 @@
+import hashlib
+import importlib
+import os
+import pickle
+import threading
+import time
+
+import joblib
+
+# Registry artefak model per proses server: setiap file pickle hanya dimuat
+# sekali dan objek yang sama dibagikan ke semua sesi Streamlit. File dimuat
+# ulang otomatis bila mtime/ukuran berubah dan isi (hash) file memang berbeda.
+# Artefak .joblib berisi array NumPy polos (misalnya forest datar, lihat
+# flat_forest.py) dimuat dengan mmap_mode='r' sehingga array dibaca langsung
+# dari page cache dan dapat dibagi antar proses. Model scikit-learn tetap
+# dimuat dari pickle: Tree.__setstate__ menyalin array node ke buffer miliknya
+# sendiri, sehingga mmap tidak menghemat memori dan justru memperlambat muat.
+_registry = {}
+_versions = {}
+_lock = threading.Lock()
+_reload_listeners = []
+
+# Modul estimator scikit-learn yang dipakai artefak model. Diimpor sekali sebelum
+# artefak pertama diukur agar biaya impor tidak terhitung sebagai memori/waktu muat model
+ESTIMATOR_MODULES = ('sklearn.linear_model', 'sklearn.preprocessing', 'sklearn.ensemble')
+
+
+def add_reload_listener(callback):
+    """
+    Mendaftarkan `callback(path)` yang dipanggil setiap kali artefak dimuat ulang.
+    """
+    _reload_listeners.append(callback)
+
+
+def _file_hash(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _load_file(path):
+    if path.endswith('.joblib'):
+        return joblib.load(path, mmap_mode='r')
+    return _load_pickle(path)
+
+
+def _import_estimator_modules():
+    for name in ESTIMATOR_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def _resident_bytes():
+    # RSS proses saat ini dari /proc (Linux); None bila tidak tersedia
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _load_entry(path, stat, file_hash):
+    # Ukur waktu muat dan kenaikan RSS selama unpickle. RSS ikut menghitung buffer C
+    # (misalnya array node pohon scikit-learn) yang tidak terlihat oleh tracemalloc;
+    # angkanya perkiraan karena thread lain dapat mengalokasikan memori bersamaan
+    _import_estimator_modules()
+    before = _resident_bytes()
+    start = time.perf_counter()
+    obj = _load_file(path)
+    load_time = time.perf_counter() - start
+    after = _resident_bytes()
+
+    return {
+        'object': obj,
+        'file': path,
+        'mtime': stat.st_mtime,
+        'size': stat.st_size,
+        'hash': file_hash,
+        'load_time': load_time,
+        'memory': max(after - before, 0) if before is not None and after is not None else None,
+        'loaded_at': time.time(),
+        'loads': 1,
+    }
+
+
+def _is_current(entry, stat):
+    return entry is not None and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size
+
+
+def load_artifact(path):
+    """
+    Mengembalikan objek dari file pickle `path` yang dibagikan ke seluruh sesi.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    entry = _registry.get(key)
+    if _is_current(entry, stat):
+        return entry['object']
+
+    with _lock:
+        entry = _registry.get(key)
+        if _is_current(entry, stat):
+            return entry['object']
+
+        file_hash = _file_hash(key)
+        if entry is not None and entry['hash'] == file_hash:
+            # Hanya mtime yang berubah, isi file sama: tidak perlu dimuat ulang
+            entry['mtime'] = stat.st_mtime
+            entry['size'] = stat.st_size
+            return entry['object']
+
+        new_entry = _load_entry(key, stat, file_hash)
+        if entry is not None:
+            new_entry['loads'] = entry['loads'] + 1
+        _registry[key] = new_entry
+
+    if entry is not None:
+        for callback in _reload_listeners:
+            callback(key)
+    return new_entry['object']
+
+
+def artifact_version(path):
+    """
+    Mengembalikan versi (potongan hash) artefak yang sedang dimuat untuk `path`.
+    """
+    load_artifact(path)
+    return _registry[os.path.abspath(path)]['hash'][:12]
+
+
+def file_version(path):
+    """
+    Versi (potongan hash isi) file `path` tanpa memuat objeknya. Hash hanya dihitung
+    ulang bila mtime/ukuran file berubah.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    entry = _registry.get(key)
+    if _is_current(entry, stat):
+        return entry['hash'][:12]
+    version = _versions.get(key)
+    if version is None or version[:2] != (stat.st_mtime, stat.st_size):
+        version = (stat.st_mtime, stat.st_size, _file_hash(key))
+        _versions[key] = version
+    return version[2][:12]
+
+
+def artifact_info():
+    """
+    Ringkasan setiap artefak di registry: waktu muat, memori, dan versi.
+    """
+    info = []
+    for path, entry in sorted(_registry.items()):
+        info.append({
+            'Artefak': os.path.relpath(path),
+            'Format': 'joblib (mmap)' if entry['file'].endswith('.joblib') else 'pickle',
+            'Versi': entry['hash'][:12],
+            'Waktu Muat (ms)': round(entry['load_time'] * 1000, 2),
+            'Kenaikan RSS (MB)': round(entry['memory'] / (1024 * 1024), 2) if entry['memory'] is not None else None,
+            'Ukuran File (MB)': round(entry['size'] / (1024 * 1024), 2),
+            'Jumlah Muat': entry['loads'],
+        })
+    return info
@@ -0,0 +1,279 @@
+"""
+Geometri wilayah Kabupaten Badung (resources/5103.geojson) untuk peta halaman Analisa.
+
+Batas wilayah dibaca dan disederhanakan sekali per proses lalu dibagikan ke semua sesi.
+Peta menampilkan agregat per kecamatan/kelurahan: choropleth bila file GeoJSON memuat
+poligon wilayah tersebut, atau gelembung di titik tengah proyek tiap wilayah beserta
+garis batas kabupaten bila hanya batas kabupaten yang tersedia.
+
+Koordinat proyek juga dicocokkan dengan wilayah secara vektor (point-in-polygon dengan
+indeks strip lintang) untuk menandai proyek di luar Badung atau yang kecamatannya tidak
+sesuai dengan koordinatnya (hanya bila poligon kecamatan tersedia).
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+BOUNDARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', '5103.geojson')
+
+# Toleransi penyederhanaan garis batas dalam derajat (0.0005 derajat sekitar 55 meter)
+SIMPLIFY_TOLERANCE = float(os.environ.get('PRIDE_MAP_TOLERANCE', '0.0005'))
+
+MAP_CENTER = {"lat": -8.670458, "lon": 115.212629}
+
+# Jumlah strip lintang pada indeks spasial poligon
+INDEX_STRIPS = 64
+
+# Awalan nama fitur yang diabaikan saat mencocokkan dengan nilai kecamatan_usaha/kelurahan_usaha
+AREA_PREFIXES = ('KABUPATEN ', 'KECAMATAN ', 'KEC. ', 'KELURAHAN ', 'KEL. ', 'DESA ')
+
+_boundaries = {}
+_boundaries_lock = threading.Lock()
+
+
+def simplify_ring(ring, tolerance=SIMPLIFY_TOLERANCE):
+    """
+    Menyederhanakan satu ring koordinat (array N x 2) dengan algoritma Douglas-Peucker.
+    Titik awal dan akhir selalu dipertahankan sehingga ring tetap tertutup.
+    """
+    ring = np.asarray(ring, dtype=float)
+    if len(ring) <= 3 or tolerance <= 0:
+        return ring
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = ring[end] - ring[start]
+        points = ring[start + 1:end] - ring[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(points[:, 0], points[:, 1])
+        else:
+            distances = np.abs(segment[0] * points[:, 1] - segment[1] * points[:, 0]) / length
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance:
+            middle = start + 1 + farthest
+            keep[middle] = True
+            stack.extend([(start, middle), (middle, end)])
+    return ring[keep]
+
+
+def build_strip_index(polygons, strips=INDEX_STRIPS):
+    """
+    Indeks spasial poligon: rentang lintang dibagi menjadi `strips` strip sama tinggi dan
+    setiap strip menyimpan sisi poligon (x1, y1, x2, y2) yang melintasinya. Uji titik
+    cukup memeriksa sisi pada strip titik tersebut, bukan seluruh sisi poligon.
+    """
+    edges = np.concatenate([np.hstack([ring[:-1], ring[1:]]) for polygon in polygons for ring in polygon
+                            if len(ring) > 1])
+    lon_min, lat_min = np.minimum(edges[:, :2], edges[:, 2:]).min(axis=0)
+    lon_max, lat_max = np.maximum(edges[:, :2], edges[:, 2:]).max(axis=0)
+    height = (lat_max - lat_min) / strips or 1.0
+    low = np.clip(((np.minimum(edges[:, 1], edges[:, 3]) - lat_min) // height).astype(int), 0, strips - 1)
+    high = np.clip(((np.maximum(edges[:, 1], edges[:, 3]) - lat_min) // height).astype(int), 0, strips - 1)
+    return {
+        'bounds': (lon_min, lat_min, lon_max, lat_max),
+        'height': height,
+        'strips': [edges[(low <= strip) & (high >= strip)] for strip in range(strips)],
+    }
+
+
+def points_in_polygon(lon, lat, index):
+    """
+    Boolean per titik: apakah (lon, lat) berada di dalam poligon yang diindeks `index`
+    (aturan genap-ganjil, sehingga lubang dan multipoligon ikut tertangani). Titik
+    dikelompokkan per strip lalu diuji terhadap sisi strip itu sekaligus.
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    lon_min, lat_min, lon_max, lat_max = index['bounds']
+    inside = np.zeros(len(lon), dtype=bool)
+    candidates = np.flatnonzero((lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max))
+    if len(candidates) == 0:
+        return inside
+
+    strip_of = np.clip(((lat[candidates] - lat_min) // index['height']).astype(int), 0, len(index['strips']) - 1)
+    order = np.argsort(strip_of, kind='stable')
+    strip_ids, starts = np.unique(strip_of[order], return_index=True)
+    for strip, members in zip(strip_ids, np.split(candidates[order], starts[1:])):
+        edges = index['strips'][strip]
+        if len(edges) == 0:
+            continue
+        x1, y1, x2, y2 = (edges[:, i] for i in range(4))
+        px, py = lon[members, None], lat[members, None]
+        # Sisi dilintasi sinar horizontal ke kanan dari titik bila y titik berada di antara y1 dan y2
+        crosses = (y1 > py) != (y2 > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        inside[members] = (crosses & (px < x_cross)).sum(axis=1) % 2 == 1
+    return inside
+
+
+def _polygons(geometry):
+    # Daftar poligon (list ring array N x 2) dari geometri Polygon/MultiPolygon
+    if geometry['type'] == 'Polygon':
+        return [[np.asarray(ring, dtype=float) for ring in geometry['coordinates']]]
+    if geometry['type'] == 'MultiPolygon':
+        return [[np.asarray(ring, dtype=float) for ring in polygon] for polygon in geometry['coordinates']]
+    return []
+
+
+def area_name(name):
+    """
+    Nama wilayah yang dinormalisasi untuk pencocokan: huruf besar tanpa awalan administratif.
+    """
+    name = ' '.join(str(name).upper().split())
+    for prefix in AREA_PREFIXES:
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+
+def _read_boundaries(path):
+    with open(path) as f:
+        collection = json.load(f)
+    features = []
+    for feature in collection['features']:
+        polygons = _polygons(feature['geometry'])
+        if not polygons:
+            continue
+        properties = feature.get('properties') or {}
+        features.append({
+            'name': area_name(properties.get('name', '')),
+            'properties': properties,
+            'polygons': polygons,
+            'simplified': [[simplify_ring(ring) for ring in polygon] for polygon in polygons],
+            'index': build_strip_index(polygons),
+        })
+    return features
+
+
+def load_boundaries(path=BOUNDARY_FILE):
+    """
+    Fitur wilayah dari file GeoJSON: nama ternormalisasi, properti, poligon asli, dan poligon
+    yang sudah disederhanakan. Dibaca sekali per proses dan dibaca ulang bila file berubah.
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime
+    entry = _boundaries.get(key)
+    if entry is None or entry['mtime'] != mtime:
+        with _boundaries_lock:
+            entry = _boundaries.get(key)
+            if entry is None or entry['mtime'] != mtime:
+                entry = {'mtime': mtime, 'features': _read_boundaries(key)}
+                _boundaries[key] = entry
+    return entry['features']
+
+
+def boundary_lines(path=BOUNDARY_FILE):
+    """
+    Koordinat (lon, lat) garis batas yang sudah disederhanakan untuk trace garis plotly,
+    dengan None sebagai pemisah antar ring.
+    """
+    lon, lat = [], []
+    for feature in load_boundaries(path):
+        for polygon in feature['simplified']:
+            for ring in polygon:
+                lon.extend(ring[:, 0].tolist() + [None])
+                lat.extend(ring[:, 1].tolist() + [None])
+    return lon, lat
+
+
+def area_geojson(labels, path=BOUNDARY_FILE):
+    """
+    FeatureCollection poligon sederhana untuk wilayah yang namanya cocok dengan `labels`;
+    id fitur berisi label aslinya. None bila tidak ada wilayah yang cocok.
+    """
+    names = {area_name(label): label for label in labels}
+    features = []
+    for feature in load_boundaries(path):
+        label = names.get(feature['name'])
+        if label is None:
+            continue
+        coordinates = [[ring.tolist() for ring in polygon] for polygon in feature['simplified']]
+        features.append({'type': 'Feature', 'id': label, 'properties': {'name': label},
+                         'geometry': {'type': 'MultiPolygon', 'coordinates': coordinates}})
+    if not features:
+        return None
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def aggregate_areas(dataset, by):
+    """
+    Jumlah proyek dan total investasi per nilai `by` dari cube agregat, beserta titik tengah
+    (rata-rata koordinat) proyek yang berada di dalam batas kabupaten.
+    """
+    data = dataset.data
+    result = dataset.cube.rollup(by)[[by, 'Jumlah', 'Jumlah Investasi']]
+    result = result.rename(columns={'Jumlah': 'Jumlah Proyek'})
+
+    longitude = pd.to_numeric(data['longitude'], errors='coerce')
+    latitude = pd.to_numeric(data['latitude'], errors='coerce')
+    inside = np.zeros(len(data), dtype=bool)
+    for feature in load_boundaries():
+        inside |= points_in_polygon(longitude, latitude, feature['index'])
+    coordinates = pd.DataFrame({by: data[by], 'latitude': latitude, 'longitude': longitude})[inside]
+    centers = coordinates.groupby(by, observed=True)[['latitude', 'longitude']].mean().reset_index()
+    centers[by] = centers[by].astype(object)
+    result[by] = result[by].astype(object)
+    return result.merge(centers, on=by, how='left')
+
+
+def has_area_polygons(labels, path=BOUNDARY_FILE):
+    """
+    True bila file GeoJSON memuat poligon untuk setidaknya satu nilai `labels`.
+    """
+    names = {area_name(label) for label in labels if pd.notna(label)}
+    return any(feature['name'] in names for feature in load_boundaries(path))
+
+
+def match_areas(data, by='kecamatan_usaha', path=BOUNDARY_FILE):
+    """
+    Mencocokkan koordinat setiap proyek dengan wilayah pada file GeoJSON. Mengembalikan
+    DataFrame (indeks sama dengan `data`) berisi:
+
+    - 'Koordinat Kosong': latitude/longitude kosong atau bukan angka;
+    - 'Di Luar Badung': koordinat terisi tetapi berada di luar semua poligon;
+    - 'Wilayah Koordinat': nilai `by` dari poligon wilayah yang memuat titik;
+    - 'Wilayah Tidak Sesuai': `by` terisi dan nama ternormalisasinya (`area_name`) berbeda dengan
+      nama poligon wilayah yang memuat titik.
+
+    Kedua kolom wilayah hanya terisi bila file memuat poligon wilayah `by` (lihat
+    `has_area_polygons`); dengan batas kabupaten saja tidak ada baris yang ditandai tidak sesuai.
+    """
+    longitude = pd.to_numeric(data['longitude'], errors='coerce').to_numpy(dtype=float)
+    latitude = pd.to_numeric(data['latitude'], errors='coerce').to_numpy(dtype=float)
+    labels = data[by].astype(object).where(data[by].notna(), None).to_numpy()
+    labelled = pd.notna(labels)
+    missing = np.isnan(longitude) | np.isnan(latitude)
+
+    features = load_boundaries(path)
+    normalized = {label: area_name(label) for label in pd.unique(labels) if label is not None}
+    names = {name: label for label, name in normalized.items()}
+    inside = np.zeros(len(data), dtype=bool)
+    located = np.full(len(data), None, dtype=object)
+    located_names = np.full(len(data), None, dtype=object)
+    for feature in features:
+        hit = points_in_polygon(longitude, latitude, feature['index'])
+        inside |= hit
+        label = names.get(feature['name'])
+        if label is not None:
+            hit &= pd.isna(located)
+            located[hit] = label
+            located_names[hit] = feature['name']
+
+    # Dibandingkan dengan nama ternormalisasi agar "Kuta", "KUTA", dan "Kecamatan Kuta" dianggap sama
+    label_names = np.array([normalized.get(label) for label in labels], dtype=object)
+    mismatch = labelled & pd.notna(located_names) & (located_names != label_names)
+    return pd.DataFrame({
+        'Koordinat Kosong': missing,
+        'Di Luar Badung': ~missing & ~inside,
+        'Wilayah Koordinat': located,
+        'Wilayah Tidak Sesuai': mismatch,
+    }, index=data.index)
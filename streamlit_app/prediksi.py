@@ -1,39 +1,14 @@
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import pickle
 from sklearn.preprocessing import StandardScaler
-from io import BytesIO  # Untuk menyimpan file secara sementara
-
-# Fungsi untuk memuat model dan scaler dari file pickle
-def load_model_and_scaler(model_filename, scaler_filename):
-    with open(model_filename, 'rb') as model_file:
-        loaded_model = pickle.load(model_file)
-    with open(scaler_filename, 'rb') as scaler_file:
-        loaded_scaler = pickle.load(scaler_file)
-    return loaded_model, loaded_scaler
-
-# Fungsi untuk melakukan prediksi berdasarkan input pengguna
-def predict_user_input(user_input, model_filename, scaler_filename):
-    model, scaler = load_model_and_scaler(model_filename, scaler_filename)
-    user_input_scaled = scaler.transform([user_input])
-    prediction = model.predict(user_input_scaled)
-    return prediction[0]
-
-# Fungsi untuk mapping kategori prediksi investasi
-def map_kategori_investasi(predictionRF):
-    if predictionRF == 1:
-        return "Tinggi"
-    else:
-        return "Rendah"
-
-# Fungsi untuk mengubah dataframe menjadi file Excel yang bisa diunduh
-def to_excel(df):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False)
-    processed_data = output.getvalue()
-    return processed_data
+from model_registry import artifact_info
+from export import download_section
+from scoring import (MODEL_FILENAME, SCALER_FILENAME, MODEL_RF_FILENAME, REQUIRED_COLUMNS, DEFAULT_CHUNKSIZE,
+                     DEFAULT_N_WORKERS, FORECAST_MIN_YEAR, FORECAST_MAX_YEAR, forecast_with_history,
+                     predict_batch, predict_manual, manual_cache_info, read_header, score_stream)
 
 # Fungsi untuk menghasilkan deskripsi otomatis dari diagram pie
 def generate_pie_description(category_counts):
@@ -46,11 +21,69 @@ def generate_pie_description(category_counts):
     
     return deskripsi
 
+# Fungsi untuk menampilkan pie chart dan deskripsi kategori hasil prediksi
+def show_category_summary(category_counts):
+    # Menampilkan visualisasi pie chart
+    st.write("Visualisasi Rasio Investasi Kategori Tinggi dan Rendah:")
+    fig_pie = px.pie(values=category_counts.values, names=category_counts.index,
+                     title='Rasio Investasi Kategori Tinggi dan Rendah',
+                     labels={'index': 'Kategori', 'values': 'Jumlah'})
+    st.plotly_chart(fig_pie)
+
+    # Deskripsi otomatis berdasarkan diagram pie
+    pie_description = generate_pie_description(category_counts)
+    st.write("**Analisis deskriptif hasil prediksi :**")
+    st.write(pie_description)
+
+# Fungsi prediksi file besar: dibaca, diprediksi, dan ditulis per potongan baris
+def prediksi_streaming(uploaded_file, model_filename, modelRF_filename, scaler_filename, n_workers=DEFAULT_N_WORKERS):
+    if not uploaded_file.name.lower().endswith('.xlsx'):
+        st.error("Mode streaming hanya mendukung file Excel (.xlsx).")
+        return
+
+    # Pastikan kolom yang dibutuhkan ada (hanya membaca baris header)
+    required_columns = REQUIRED_COLUMNS
+    header = read_header(uploaded_file)
+    if not all(col in header for col in required_columns):
+        st.error(f"File harus mengandung kolom berikut: {', '.join(required_columns)}")
+        return
+
+    chunksize = st.number_input('Jumlah baris per potongan:', min_value=500, value=DEFAULT_CHUNKSIZE, step=500)
+
+    if st.button('Prediksi'):
+        progress_bar = st.progress(0.0, text="Memproses data...")
+
+        def update_progress(processed, total_rows):
+            if total_rows:
+                progress_bar.progress(min(processed / total_rows, 1.0),
+                                      text=f"{processed:,} dari {total_rows:,} baris diproses")
+            else:
+                progress_bar.progress(0.0, text=f"{processed:,} baris diproses")
+
+        # Hasil ditulis ke file sementara dalam mode constant memory xlsxwriter
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+            output_path = tmp.name
+        try:
+            n_rows, category_counts = score_stream(uploaded_file, output_path, int(chunksize), update_progress,
+                                                   model_filename, modelRF_filename, scaler_filename, n_workers)
+            with open(output_path, 'rb') as result_file:
+                result_xlsx = result_file.read()
+        except ValueError as e:
+            # Misalnya nilai kosong pada kolom fitur atau potongan berikutnya tanpa kolom yang dibutuhkan
+            progress_bar.empty()
+            st.error(f"Terjadi kesalahan saat memprediksi data: {e}")
+            return
+        finally:
+            os.remove(output_path)
+
+        progress_bar.progress(1.0, text=f"Selesai: {n_rows:,} baris diproses")
+
+        if n_rows > 0:
+            show_category_summary(category_counts)
+
+        st.download_button(label="Unduh Hasil Prediksi", data=result_xlsx, file_name="hasil_prediksi.xlsx", mime="application/vnd.ms-excel")
+
 def prediksi():
-    # Memuat model yang sudah disimpan
-    with open('streamlit_app/linear_regression_model.pkl', 'rb') as file:
-        loaded_model = pickle.load(file)
-        
     st.markdown("<h1 style='text-align: center;'>Menu Prediksi Investasi</h1>", unsafe_allow_html=True)
     
     # Menu dropdown untuk memilih jenis prediksi
@@ -61,26 +94,15 @@ def prediksi():
     )
 
     if option == 'Prediksi Jumlah Investasi Berdasarkan Tahun':
-        # Memuat model regresi linear
-        model_filename = 'streamlit_app/linear_regression_model.pkl'
-
-        data = pd.DataFrame({
-            'Year': [2018, 2019, 2020, 2021, 2022, 2023],
-            'Jumlah Investasi': [8233274390221, 20717720510244, 15666957301328, 16720571318394, 7947606550602, 120869283284370]
-        })
-
         # Input dari pengguna untuk tahun prediksi
-        year_input = st.number_input('Masukkan Tahun:', min_value=2024, max_value=2100, step=1)
+        year_input = st.number_input('Masukkan Tahun:', min_value=FORECAST_MIN_YEAR, max_value=FORECAST_MAX_YEAR, step=1)
 
         if st.button('Prediksi'):
-            # Melakukan prediksi menggunakan model
-            input_data = pd.DataFrame({'Year': [year_input]})
-            prediction = loaded_model.predict(input_data)
-
-            # Menambahkan hasil prediksi ke data historis
-            data = data.append({'Year': year_input, 'Jumlah Investasi': prediction[0]}, ignore_index=True)
+            # Mengambil hasil prediksi dari tabel yang dihitung sekali saat model dimuat
+            data = forecast_with_history(year_input)
+            prediction = data['Jumlah Investasi'].iloc[-1]
 
-            st.write(f'Prediksi Jumlah Investasi **Tahun {year_input}** adalah **Rp {prediction[0]:,.2f}**')
+            st.write(f'Prediksi Jumlah Investasi **Tahun {year_input}** adalah **Rp {prediction:,.2f}**')
 
             # Visualisasi tren jumlah investasi per tahun (termasuk prediksi)
             fig = px.line(data, x='Year', y='Jumlah Investasi', 
@@ -102,9 +124,9 @@ def prediksi():
 
     elif option == 'Prediksi Jumlah Investasi Berdasarkan Komponen':
         # Memuat model regresi linear dan scaler
-        model_filename = 'streamlit_app/resources/linear_model.pkl'
-        scaler_filename = 'streamlit_app/resources/scaler.pkl'
-        modelRF_filename = 'streamlit_app/resources/random_forest_model.pkl'
+        model_filename = MODEL_FILENAME
+        scaler_filename = SCALER_FILENAME
+        modelRF_filename = MODEL_RF_FILENAME
 
         # Opsi untuk memilih input manual atau unggah file
         input_option = st.radio("Pilih Metode Input:", ('Input Manual', 'Unggah File Excel'))
@@ -112,7 +134,7 @@ def prediksi():
         if input_option == 'Input Manual':
             # Input manual dari pengguna untuk fitur komponen
             st.write('Masukkan nilai untuk setiap komponen:')
-            feature_columns = ['Mesin Peralatan', 'Mesin Peralatan Impor', 'Pembelian Pematangan Tanah', 'Bangunan Gedung', 'Modal Kerja',  'Lain Lain', 'TKI']
+            feature_columns = REQUIRED_COLUMNS
             user_input = []
 
             for feature in feature_columns:
@@ -120,67 +142,70 @@ def prediksi():
                 user_input.append(value)
 
             if st.button('Prediksi'):
-                # Prediksi jumlah investasi berdasarkan komponen
-                prediction = predict_user_input(user_input, model_filename, scaler_filename)
+                # Prediksi jumlah dan kategori investasi (hasil input yang sama diambil dari cache)
+                prediction, kategori_investasi = predict_manual(user_input, model_filename, modelRF_filename, scaler_filename)
                 st.write(f'Prediksi Jumlah Investasi Berdasarkan Komponen: **Rp {prediction:,.2f}**')
-
-                # Prediksi kategori jumlah investasi berdasarkan komponen
-                predictionRF = predict_user_input(user_input, modelRF_filename, scaler_filename)
-                kategori_investasi = map_kategori_investasi(predictionRF)
                 st.write(f'Prediksi Kategori Jumlah Investasi Berdasarkan Komponen: **{kategori_investasi}**')
+
+            cache_info = manual_cache_info()
+            st.caption(f"Cache prediksi: {cache_info.hits} hit, {cache_info.misses} miss, "
+                       f"{cache_info.currsize}/{cache_info.maxsize} entri")
         
         elif input_option == 'Unggah File Excel':
             # Unggah file Excel
             uploaded_file = st.file_uploader("Unggah file Excel", type=["xlsx", "xls"])
             
             if uploaded_file is not None:
-                # Membaca file Excel
-                df = pd.read_excel(uploaded_file)
-                st.write("Data yang diunggah:")
-                st.write(df)
-
-                # Pastikan kolom yang dibutuhkan ada
-                required_columns = ['Mesin Peralatan', 'Mesin Peralatan Impor', 'Pembelian Pematangan Tanah', 'Bangunan Gedung', 'Modal Kerja', 'Lain Lain', 'TKI']
-                if all(col in df.columns for col in required_columns):
-                    # Mengambil hanya kolom yang diperlukan
-                    feature_data = df[required_columns]
-
-                    if st.button('Prediksi'):
-                        # Melakukan prediksi untuk setiap baris data
-                        predictions = []
-                        categories = []
-                        for i, row in feature_data.iterrows():
-                            user_input = row.values.tolist()
-                            pred = predict_user_input(user_input, model_filename, scaler_filename)
-                            predRF = predict_user_input(user_input, modelRF_filename, scaler_filename)
-                            predictions.append(pred)
-                            categories.append(map_kategori_investasi(predRF))
-
-                        # Menambahkan hasil prediksi ke dataframe
-                        df['Prediksi Investasi'] = predictions
-                        df['Kategori Investasi'] = categories
-
-                        st.write("Hasil Prediksi:")
-                        st.write(df)
-
-                        # Menampilkan visualisasi pie chart
-                        st.write("Visualisasi Rasio Investasi Kategori Tinggi dan Rendah:")
-                        category_counts = df['Kategori Investasi'].value_counts()
-                        fig_pie = px.pie(values=category_counts.values, names=category_counts.index,
-                                         title='Rasio Investasi Kategori Tinggi dan Rendah',
-                                         labels={'index': 'Kategori', 'values': 'Jumlah'})
-                        st.plotly_chart(fig_pie)
-
-                        # Deskripsi otomatis berdasarkan diagram pie
-                        pie_description = generate_pie_description(category_counts)
-                        st.write("**Analisis deskriptif hasil prediksi :**")
-                        st.write(pie_description)
-
-                        # Menyediakan opsi untuk mengunduh hasil prediksi
-                        result_xlsx = to_excel(df)
-                        st.download_button(label="Unduh Hasil Prediksi", data=result_xlsx, file_name="hasil_prediksi.xlsx", mime="application/vnd.ms-excel")
+                # Mode streaming membaca, memprediksi, dan menulis file per potongan
+                streaming = st.checkbox("Mode streaming (untuk file berukuran besar)",
+                                        help="File diproses per potongan baris sehingga penggunaan memori tetap kecil.")
+
+                # Jumlah worker untuk inferensi random forest secara paralel
+                max_workers = os.cpu_count() or 1
+                n_workers = st.number_input('Jumlah worker random forest:', min_value=1, max_value=max_workers,
+                                            value=min(DEFAULT_N_WORKERS, max_workers), step=1)
+
+                if streaming:
+                    prediksi_streaming(uploaded_file, model_filename, modelRF_filename, scaler_filename, int(n_workers))
                 else:
-                    st.error(f"File harus mengandung kolom berikut: {', '.join(required_columns)}")
+                    # Membaca file Excel
+                    df = pd.read_excel(uploaded_file)
+                    st.write("Data yang diunggah:")
+                    st.write(df)
+
+                    # Pastikan kolom yang dibutuhkan ada
+                    required_columns = REQUIRED_COLUMNS
+                    if all(col in df.columns for col in required_columns):
+                        # Mengambil hanya kolom yang diperlukan
+                        feature_data = df[required_columns]
+
+                        if st.button('Prediksi'):
+                            # Melakukan prediksi untuk seluruh baris sekaligus
+                            predictions, categories = predict_batch(feature_data, model_filename, modelRF_filename, scaler_filename, int(n_workers))
+
+                            # Menambahkan hasil prediksi ke dataframe
+                            df['Prediksi Investasi'] = predictions
+                            df['Kategori Investasi'] = categories
+
+                            # Hasil disimpan di sesi agar tetap tampil saat file unduhan disiapkan
+                            st.session_state['hasil_prediksi'] = (uploaded_file.file_id, df)
+
+                        hasil_prediksi = st.session_state.get('hasil_prediksi')
+                        if hasil_prediksi is not None and hasil_prediksi[0] == uploaded_file.file_id:
+                            df = hasil_prediksi[1]
+                            st.write("Hasil Prediksi:")
+                            st.write(df)
+
+                            show_category_summary(df['Kategori Investasi'].value_counts())
+
+                            # Menyediakan opsi untuk mengunduh hasil prediksi (file dibuat saat diminta)
+                            download_section(df, 'hasil_prediksi', key='hasil_prediksi', label="Unduh Hasil Prediksi")
+                    else:
+                        st.error(f"File harus mengandung kolom berikut: {', '.join(required_columns)}")
+
+    # Informasi artefak model yang dimuat di proses server ini
+    with st.expander("Informasi Model"):
+        st.dataframe(pd.DataFrame(artifact_info()))
 
 if __name__ == "__main__":
     prediksi()
@@ -0,0 +1,271 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from model_registry import load_artifact, artifact_version, file_version, add_reload_listener
+from flat_forest import load_flat_forest, predict_flat
+from export import open_excel_writer, write_rows
+
+# Model regresi linear untuk prediksi jumlah investasi berdasarkan tahun
+YEAR_MODEL_FILENAME = 'streamlit_app/linear_regression_model.pkl'
+
+# Rentang tahun yang dapat diprediksi dan data historis jumlah investasi
+FORECAST_MIN_YEAR = 2024
+FORECAST_MAX_YEAR = 2100
+HISTORICAL_INVESTMENT = pd.DataFrame({
+    'Year': [2018, 2019, 2020, 2021, 2022, 2023],
+    'Jumlah Investasi': [8233274390221, 20717720510244, 15666957301328, 16720571318394, 7947606550602, 120869283284370]
+})
+
+# Lokasi artefak model prediksi berdasarkan komponen
+MODEL_FILENAME = 'streamlit_app/resources/linear_model.pkl'
+SCALER_FILENAME = 'streamlit_app/resources/scaler.pkl'
+MODEL_RF_FILENAME = 'streamlit_app/resources/random_forest_model.pkl'
+
+# Kolom komponen yang wajib ada untuk prediksi
+REQUIRED_COLUMNS = ['Mesin Peralatan', 'Mesin Peralatan Impor', 'Pembelian Pematangan Tanah', 'Bangunan Gedung', 'Modal Kerja', 'Lain Lain', 'TKI']
+
+# Label kategori untuk setiap kelas hasil random forest
+KATEGORI_INVESTASI = {1: "Tinggi", 0: "Rendah"}
+
+# Jumlah worker default untuk inferensi random forest (1 = serial)
+DEFAULT_N_WORKERS = int(os.environ.get('PRIDE_N_WORKERS', '1'))
+
+# Batch yang lebih kecil dari ini per worker tidak dipecah ke thread pool
+MIN_ROWS_PER_WORKER = 1000
+
+# Batch sampai ukuran ini dievaluasi dengan forest datar (lebih cepat untuk sedikit baris)
+FLAT_FOREST_MAX_ROWS = 256
+
+# Jumlah maksimum hasil prediksi input manual yang disimpan di cache LRU
+MANUAL_CACHE_SIZE = 256
+
+
+# Fungsi untuk memuat model dan scaler dari registry (dimuat sekali per proses)
+def load_model_and_scaler(model_filename, scaler_filename):
+    loaded_model = load_artifact(model_filename)
+    loaded_scaler = load_artifact(scaler_filename)
+    return loaded_model, loaded_scaler
+
+
+# Fungsi untuk mapping kategori prediksi investasi
+def map_kategori_investasi(predictionRF):
+    if predictionRF == 1:
+        return "Tinggi"
+    else:
+        return "Rendah"
+
+
+def map_kategori_investasi_batch(predictionsRF):
+    """
+    Versi vektor dari map_kategori_investasi untuk seluruh array prediksi.
+    """
+    return np.where(np.asarray(predictionsRF) == 1, KATEGORI_INVESTASI[1], KATEGORI_INVESTASI[0])
+
+
+@functools.lru_cache(maxsize=MANUAL_CACHE_SIZE)
+def _predict_manual_cached(features, versions, model_filename, modelRF_filename, scaler_filename):
+    # `versions` hanya bagian dari kunci cache agar hasil lama tidak dipakai setelah model berubah
+    model, scaler = load_model_and_scaler(model_filename, scaler_filename)
+    features_scaled = scaler.transform([list(features)])
+    prediction = model.predict(features_scaled)[0]
+    kategori_investasi = map_kategori_investasi(predict_rf(modelRF_filename, features_scaled)[0])
+    return prediction, kategori_investasi
+
+
+def predict_manual(user_input, model_filename=MODEL_FILENAME, modelRF_filename=MODEL_RF_FILENAME,
+                   scaler_filename=SCALER_FILENAME):
+    """
+    Prediksi satu vektor komponen dengan cache LRU yang dikunci pada nilai fitur
+    dan versi setiap artefak model. Mengembalikan (prediksi investasi, kategori).
+    Versi dihitung dari isi file sehingga model random forest scikit-learn tidak
+    dimuat bila prediksi cukup memakai forest datar.
+    """
+    versions = tuple(file_version(path) for path in (model_filename, modelRF_filename, scaler_filename))
+    features = tuple(float(value) for value in user_input)
+    return _predict_manual_cached(features, versions, model_filename, modelRF_filename, scaler_filename)
+
+
+def manual_cache_info():
+    return _predict_manual_cached.cache_info()
+
+
+@functools.lru_cache(maxsize=4)
+def _forecast_table(model_filename, version):
+    model = load_artifact(model_filename)
+    forecast = pd.DataFrame({'Year': range(FORECAST_MIN_YEAR, FORECAST_MAX_YEAR + 1)})
+    forecast['Jumlah Investasi'] = model.predict(forecast[['Year']])
+    table = pd.concat([HISTORICAL_INVESTMENT.assign(Prediksi=False), forecast.assign(Prediksi=True)],
+                      ignore_index=True)
+    return table.set_index('Year', drop=False)
+
+
+def forecast_table(model_filename=YEAR_MODEL_FILENAME):
+    """
+    Tabel data historis dan prediksi seluruh tahun FORECAST_MIN_YEAR..FORECAST_MAX_YEAR,
+    dihitung sekali per versi model. Kolom: Year, Jumlah Investasi, Prediksi.
+    """
+    return _forecast_table(model_filename, artifact_version(model_filename))
+
+
+def forecast_with_history(year, model_filename=YEAR_MODEL_FILENAME):
+    """
+    Data historis ditambah satu baris prediksi untuk `year`, siap untuk grafik tren.
+    """
+    table = forecast_table(model_filename)
+    return table[~table['Prediksi'] | (table['Year'] == year)][['Year', 'Jumlah Investasi']].reset_index(drop=True)
+
+
+def _clear_prediction_caches(path):
+    _predict_manual_cached.cache_clear()
+    _forecast_table.cache_clear()
+
+
+# Entri cache dibuang setiap kali registry memuat ulang sebuah artefak
+add_reload_listener(_clear_prediction_caches)
+
+
+def predict_parallel(model, features, n_workers=DEFAULT_N_WORKERS):
+    """
+    Membagi baris `features` ke beberapa thread dan menggabungkan hasil `model.predict`.
+    Prediksi tiap baris independen sehingga hasilnya identik dengan jalur serial;
+    evaluasi pohon scikit-learn melepas GIL sehingga thread berjalan paralel.
+    """
+    n_workers = max(1, min(int(n_workers), len(features) // MIN_ROWS_PER_WORKER))
+    if n_workers == 1:
+        return model.predict(features)
+
+    parts = np.array_split(np.asarray(features), n_workers)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(model.predict, parts))
+    return np.concatenate(results)
+
+
+def predict_rf(modelRF_filename, features_scaled, n_workers=DEFAULT_N_WORKERS):
+    """
+    Prediksi random forest: batch kecil memakai forest datar (hasil identik,
+    lihat flat_forest.py) bila sudah diekspor, batch besar memakai scikit-learn.
+    """
+    if len(features_scaled) <= FLAT_FOREST_MAX_ROWS:
+        forest = load_flat_forest(modelRF_filename)
+        if forest is not None:
+            return predict_flat(forest, features_scaled)
+    return predict_parallel(load_artifact(modelRF_filename), features_scaled, n_workers)
+
+
+def predict_batch(feature_data, model_filename=MODEL_FILENAME, modelRF_filename=MODEL_RF_FILENAME,
+                  scaler_filename=SCALER_FILENAME, n_workers=DEFAULT_N_WORKERS):
+    """
+    Memprediksi seluruh baris sekaligus: scaler dijalankan sekali untuk seluruh
+    matriks fitur, lalu model linear dan random forest masing-masing sekali.
+    Random forest dibagi ke `n_workers` thread bila batch cukup besar.
+    Mengembalikan tuple (prediksi investasi, kategori investasi).
+    """
+    model, scaler = load_model_and_scaler(model_filename, scaler_filename)
+
+    features = feature_data[REQUIRED_COLUMNS].astype(float)
+    if len(features) == 0:
+        return np.empty(0), np.empty(0, dtype=object)
+
+    features_scaled = scaler.transform(features)
+    predictions = model.predict(features_scaled)
+    categories = map_kategori_investasi_batch(predict_rf(modelRF_filename, features_scaled, n_workers))
+    return predictions, categories
+
+
+# Jumlah baris yang dibaca, diprediksi, dan ditulis per potongan pada mode streaming
+DEFAULT_CHUNKSIZE = 5000
+
+
+def read_header(source):
+    """
+    Membaca baris header file Excel (.xlsx) atau CSV tanpa memuat seluruh isi file.
+    """
+    chunks = iter_chunks(source, chunksize=1)
+    try:
+        return next(chunks)[1].columns.tolist()
+    finally:
+        # Menutup generator agar workbook read-only langsung ditutup
+        chunks.close()
+
+
+def iter_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Membaca file .xlsx (openpyxl mode read-only) atau .csv per potongan.
+    Menghasilkan tuple (total_baris_atau_None, DataFrame potongan).
+    """
+    name = getattr(source, 'name', str(source))
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    if name.lower().endswith('.csv'):
+        for chunk in pd.read_csv(source, chunksize=chunksize):
+            yield None, chunk
+        return
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        total_rows = worksheet.max_row - 1 if worksheet.max_row else None
+        rows = worksheet.iter_rows(values_only=True)
+        header = [str(col) for col in next(rows, ())]
+
+        buffer = []
+        yielded = False
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row[:len(header)])
+            if len(buffer) >= chunksize:
+                yield total_rows, pd.DataFrame(buffer, columns=header)
+                buffer = []
+                yielded = True
+        # Sisa baris terakhir (atau potongan kosong bila file hanya berisi header)
+        if buffer or not yielded:
+            yield total_rows, pd.DataFrame(buffer, columns=header)
+    finally:
+        workbook.close()
+
+
+def score_stream(source, output_path, chunksize=DEFAULT_CHUNKSIZE, progress_callback=None,
+                 model_filename=MODEL_FILENAME, modelRF_filename=MODEL_RF_FILENAME,
+                 scaler_filename=SCALER_FILENAME, n_workers=DEFAULT_N_WORKERS):
+    """
+    Membaca, memprediksi, dan menulis hasil ke `output_path` (.xlsx) per potongan
+    sehingga memori puncak dibatasi oleh `chunksize`, bukan ukuran file.
+    Mengembalikan (jumlah baris, jumlah per Kategori Investasi).
+    """
+    workbook, worksheet, date_format = open_excel_writer(output_path)
+
+    category_counts = {}
+    processed = 0
+    chunks = iter_chunks(source, chunksize)
+    try:
+        for total_rows, chunk in chunks:
+            missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing:
+                raise ValueError(f"File harus mengandung kolom berikut: {', '.join(REQUIRED_COLUMNS)}")
+
+            if processed == 0:
+                header = chunk.columns.tolist() + ['Prediksi Investasi', 'Kategori Investasi']
+                worksheet.write_row(0, 0, header)
+
+            predictions, categories = predict_batch(chunk, model_filename, modelRF_filename, scaler_filename, n_workers)
+            chunk = chunk.assign(**{'Prediksi Investasi': predictions, 'Kategori Investasi': categories})
+
+            write_rows(worksheet, processed + 1, chunk.itertuples(index=False, name=None), date_format)
+
+            for category, count in pd.Series(categories).value_counts().items():
+                category_counts[category] = category_counts.get(category, 0) + int(count)
+            processed += len(chunk)
+
+            if progress_callback is not None:
+                progress_callback(processed, total_rows)
+    finally:
+        chunks.close()
+        workbook.close()
+
+    return processed, pd.Series(category_counts, dtype='int64').sort_values(ascending=False)
@@ -0,0 +1,237 @@
+"""
+Penyimpanan lokal data OSS kanonik dalam satu file SQLite (tanpa server).
+
+Admin memperbarui data sekali untuk semua pengguna, dengan mengganti seluruh data
+atau menambahkan proyek baru dari ekstrak bulanan. Halaman Analisa membaca data dari
+sini, bukan dari unggahan per sesi. Setiap proses memuat data satu kali per versi,
+lalu semua sesi memakai IndexedDataset yang sama; filter dan agregat grafik dijawab
+dari indeks dan cube di memori, sehingga SQLite hanya berperan sebagai penyimpanan.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dataset import IndexedDataset
+from ingest import DATE_COLUMN, add_derived_columns, compact_dtypes, parse_upload
+
+STORE_PATH = os.environ.get('PRIDE_STORE_PATH',
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'oss.db'))
+
+# Kolom turunan yang tidak disimpan; dihitung ulang dari 'Tanggal Terbit Oss' saat dimuat
+DERIVED_COLUMNS = ['Bulan Terbit', 'Tanggal Bulan Terbit']
+
+# Pengguna yang boleh memperbarui data tersimpan (dipisahkan koma)
+ADMIN_USERS = [user.strip() for user in os.environ.get('PRIDE_ADMIN_USERS', 'admin dpmtsp').split(',') if user.strip()]
+
+_loaded = {'version': None, 'dataset': None}
+_loaded_lock = threading.Lock()
+
+
+def _connect():
+    os.makedirs(os.path.dirname(STORE_PATH), exist_ok=True)
+    con = sqlite3.connect(STORE_PATH, timeout=30, isolation_level=None)
+    # WAL: pembaca tidak terblokir selama admin memperbarui data
+    con.execute('PRAGMA journal_mode=WAL')
+    con.execute('''CREATE TABLE IF NOT EXISTS store_log (
+        version INTEGER PRIMARY KEY AUTOINCREMENT, action TEXT, source TEXT, digest TEXT,
+        added INTEGER, duplicates INTEGER, total INTEGER, username TEXT, updated_at TEXT)''')
+    return con
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _sql_values(values):
+    # NaN/NaT menjadi NULL dan tanggal disimpan sebagai teks ISO. Array object berisi tipe Python
+    # (int/float/str) yang dapat langsung diikat sqlite3; disalin agar DataFrame asal tidak berubah
+    if pd.api.types.is_datetime64_any_dtype(values):
+        array = values.dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+    else:
+        array = values.to_numpy(dtype=object, copy=True)
+    array[pd.isna(array)] = None
+    return array
+
+
+def _insert(con, table, data):
+    columns = ', '.join(_quote(col) for col in data.columns)
+    placeholders = ', '.join('?' * len(data.columns))
+    rows = zip(*(_sql_values(data[col]) for col in data.columns))
+    con.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', rows)
+
+
+def _log(con, action, source, digest, added, duplicates, total, username):
+    con.execute('INSERT INTO store_log (action, source, digest, added, duplicates, total, username, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (action, source, digest, added, duplicates, total, username,
+                 datetime.now().isoformat(timespec='seconds')))
+    return con.execute('SELECT MAX(version) FROM store_log').fetchone()[0]
+
+
+def _stored_columns(data):
+    return data.drop(columns=[col for col in DERIVED_COLUMNS if col in data.columns])
+
+
+def is_admin(username):
+    return username in ADMIN_USERS
+
+
+def store_info():
+    """
+    Ringkasan data tersimpan dari pembaruan terakhir: versi, jumlah baris, waktu, pengguna,
+    dan nama file sumber. Versi None berarti data belum pernah diisi.
+    """
+    con = _connect()
+    try:
+        row = con.execute('SELECT version, total, updated_at, username, source FROM store_log '
+                          'ORDER BY version DESC LIMIT 1').fetchone()
+    finally:
+        con.close()
+    if row is None:
+        return {'version': None, 'rows': 0, 'updated_at': None, 'username': None, 'source': None}
+    return dict(zip(['version', 'rows', 'updated_at', 'username', 'source'], row))
+
+
+def read_store():
+    """
+    Membaca seluruh data tersimpan sesuai urutan penyimpanan, atau None bila belum ada.
+    Kolom tanggal dikembalikan sebagai datetime64; kolom turunan tidak disertakan.
+    """
+    con = _connect()
+    try:
+        if con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'oss'").fetchone() is None:
+            return None
+        data = pd.read_sql_query('SELECT * FROM oss ORDER BY rowid', con)
+    finally:
+        con.close()
+    # NULL pada kolom teks terbaca sebagai None; disamakan dengan NaN seperti hasil ingest
+    text_columns = data.columns[data.dtypes == object]
+    data[text_columns] = data[text_columns].where(data[text_columns].notna(), np.nan)
+    if DATE_COLUMN in data.columns:
+        data[DATE_COLUMN] = pd.to_datetime(data[DATE_COLUMN], format='%Y-%m-%d %H:%M:%S')
+    return data
+
+
+def _prepare(data):
+    # Tipe kolom dan kolom turunan disamakan dengan hasil normalize_upload
+    if DATE_COLUMN in data.columns:
+        data = add_derived_columns(data)
+    return compact_dtypes(data)
+
+
+def _load():
+    # (versi, IndexedDataset bersama) dari data tersimpan; dibaca ulang hanya bila versinya berubah
+    version = store_info()['version']
+    with _loaded_lock:
+        if version is not None and _loaded['version'] != version:
+            data = read_store()
+            dataset = None if data is None else IndexedDataset(_prepare(data), digest=f'store_v{version}')
+            _loaded.update(version=version, dataset=dataset)
+        return version, _loaded['dataset'] if version is not None else None
+
+
+def load_store_dataset():
+    """
+    IndexedDataset dari data tersimpan, atau None bila belum ada. Dimuat sekali per versi
+    untuk seluruh sesi; pembaruan oleh admin di proses lain terdeteksi dari nomor versi.
+    """
+    _, dataset = _load()
+    return None if dataset is None else dataset.copy()
+
+
+def replace_store(uploaded_file, correct_columns, username=None):
+    """
+    Mengganti seluruh data tersimpan dengan isi file unggahan. Tabel baru diisi terpisah
+    lalu ditukar dalam satu transaksi, sehingga pembaca selalu melihat data lama atau
+    data baru secara utuh. Mengembalikan (daftar peringatan, ringkasan).
+    """
+    upload, warnings, _ = parse_upload(uploaded_file, correct_columns)
+    data = _stored_columns(upload.data)
+
+    con = _connect()
+    try:
+        con.execute('DROP TABLE IF EXISTS oss_baru')
+        con.execute('CREATE TABLE oss_baru (' + ', '.join(f'{_quote(col)} {_sql_type(data[col].dtype)}'
+                                                           for col in data.columns) + ')')
+        con.execute('BEGIN')
+        _insert(con, 'oss_baru', data)
+        con.execute('COMMIT')
+
+        con.execute('BEGIN IMMEDIATE')
+        con.execute('DROP TABLE IF EXISTS oss')
+        con.execute('ALTER TABLE oss_baru RENAME TO oss')
+        version = _log(con, 'ganti', uploaded_file.name, upload.digest, len(data), 0, len(data), username)
+        con.execute('COMMIT')
+    except Exception:
+        if con.in_transaction:
+            con.execute('ROLLBACK')
+        raise
+    finally:
+        con.close()
+
+    # Indeks dan cube hasil parsing dipakai langsung, tidak perlu memuat ulang dari SQLite
+    dataset = upload.copy()
+    dataset.digest = f'store_v{version}'
+    with _loaded_lock:
+        _loaded.update(version=version, dataset=dataset)
+    return warnings, {'added': len(data), 'duplicates': 0, 'total': len(data)}
+
+
+def append_store(uploaded_file, correct_columns, username=None):
+    """
+    Menambahkan proyek baru dari file unggahan ke data tersimpan. Baris yang Id Proyek/Nib-nya
+    sudah ada dilewati; indeks dan cube agregat di memori hanya diperbarui untuk baris baru.
+    File yang sama tidak digabungkan dua kali. Mengembalikan (daftar peringatan, ringkasan
+    dict 'added', 'duplicates', 'total').
+    """
+    upload, warnings, _ = parse_upload(uploaded_file, correct_columns)
+    base_version, base = _load()
+    if base is None:
+        return replace_store(uploaded_file, correct_columns, username)
+
+    con = _connect()
+    try:
+        merged = con.execute(
+            "SELECT 1 FROM store_log WHERE digest = ? AND version >= "
+            "(SELECT COALESCE(MAX(version), 0) FROM store_log WHERE action = 'ganti')", (upload.digest,)).fetchone()
+        if merged is not None:
+            return warnings, {'added': 0, 'duplicates': len(upload.data), 'total': len(base.data)}
+
+        rows = base.new_rows(upload.data)
+        con.execute('BEGIN IMMEDIATE')
+        if con.execute('SELECT MAX(version) FROM store_log').fetchone()[0] != base_version:
+            raise ValueError("Data tersimpan baru saja diperbarui pengguna lain. Silakan ulangi.")
+        rows_stored = _stored_columns(rows)
+        # Kolom tambahan yang diterima ingest tetapi belum ada di tabel ditambahkan (baris lama bernilai NULL)
+        existing = {row[1] for row in con.execute('PRAGMA table_info(oss)')}
+        for col in rows_stored.columns:
+            if col not in existing:
+                con.execute(f'ALTER TABLE oss ADD COLUMN {_quote(col)} {_sql_type(rows_stored[col].dtype)}')
+        _insert(con, 'oss', rows_stored)
+        total = len(base.data) + len(rows)
+        version = _log(con, 'tambah', uploaded_file.name, upload.digest, len(rows), len(upload.data) - len(rows),
+                       total, username)
+        con.execute('COMMIT')
+    except Exception:
+        if con.in_transaction:
+            con.execute('ROLLBACK')
+        raise
+    finally:
+        con.close()
+
+    dataset = base.append(rows, digest=f'store_v{version}')
+    with _loaded_lock:
+        _loaded.update(version=version, dataset=dataset)
+    return warnings, {'added': len(rows), 'duplicates': len(upload.data) - len(rows), 'total': total}